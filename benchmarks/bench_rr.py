@@ -0,0 +1,58 @@
+"""
+@file bench_rr.py
+@date Oct 18, 2026
+
+Shows that RRScheduler scales linearly in the number of quanta.
+
+Usage: python benchmarks/bench_rr.py [--quantum Q] [--sizes N ...]
+
+Every process has a burst of ``10 * Q`` so each one is dispatched ten
+times; arrivals are sparse so the scheduler also has to skip idle gaps.
+The time per dispatched quantum should stay flat as the workload grows.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import process_logic as pl
+
+
+def make_processes(count : int, quantum : int, seed : int = 0
+                   ) -> list[pl.Process]:
+    rng = random.Random(seed)
+    arrival = 0
+    processes = []
+    for index in range(count):
+        arrival += rng.randint(0, 20 * quantum)
+        processes.append(pl.Process(name=f'P{index + 1}', arrival=arrival,
+                                    burst=10 * quantum, priority=0))
+    return processes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+            description='Round robin scaling benchmark')
+    parser.add_argument('--quantum', type=int, default=4)
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f'{"processes":>10} {"quanta":>10} {"seconds":>10} {"ns/quantum":>11}')
+    for size in args.sizes:
+        processes = make_processes(size, args.quantum)
+        quanta = sum(-(-process.burst // args.quantum) 
+                     for process in processes)
+        start = time.perf_counter()
+        pl.RRScheduler.schedule(processes, args.quantum)
+        elapsed = time.perf_counter() - start
+        print(f'{size:>10} {quanta:>10} {elapsed:>10.3f} '
+              f'{elapsed * 1e9 / quanta:>11.0f}')
+
+
+if __name__ == '__main__':
+    main()
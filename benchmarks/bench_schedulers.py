@@ -0,0 +1,195 @@
+"""
+@file bench_schedulers.py
+@date Oct 18, 2026
+
+Benchmarks every process scheduler and multilevel queue scheduler on
+synthetic workloads and reports wall time, peak memory and segments per
+second as JSON, so runs can be compared across commits.
+
+Usage: python benchmarks/bench_schedulers.py [--scales N ...]
+           [--schedulers KEY ...] [--output PATH] [--compare PATH]
+
+Workloads come from generator_logic in four shapes: dense or sparse
+Poisson arrivals (the mean gap between arrivals is half or four times the
+mean burst) crossed with short or long bursts. Multilevel queue
+schedulers get the same processes spread over four queues. Wall time is
+measured on its own; peak memory comes from a second run under
+tracemalloc, which would otherwise skew timing.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import generator_logic as gl
+import process_logic as pl
+import queue_logic as ql
+
+
+SCALES = [100, 1_000, 10_000, 100_000, 1_000_000]
+ARRIVALS = {'dense': 0.5, 'sparse': 4.0}
+BURSTS = {'short': (1, 10), 'long': (50, 150)}
+QUANTUM = 8
+QUEUE_SETTINGS = [
+        # process scheduler, priority, slice time
+        ('RR', 0, 10),
+        ('SRTF-P', 1, 20),
+        ('FCFS', 2, 30),
+        ('LPF-NP', 3, 40),
+        ]
+
+
+def make_processes(scale : int, arrivals : str, bursts : str,
+                   seed : int = 0) -> list[pl.Process]:
+    low, high = BURSTS[bursts]
+    mean_gap = ARRIVALS[arrivals] * (low + high) / 2
+    return list(gl.generate_processes(
+        seed=seed, arrivals=gl.poisson_arrivals(1 / mean_gap),
+        burst=gl.uniform(low, high), priority=gl.uniform(0, 9),
+        count=scale))
+
+
+def make_queues(processes : list[pl.Process]) -> list[ql.Queue]:
+    queues = [
+            ql.Queue(name=f'Q{index + 1}', quantum=QUANTUM, priority=priority,
+                     slice_time=slice_time, processes=[],
+                     process_scheduler=pl.PROCESS_SCHEDULERS_DICT[key])
+            for index, (key, priority, slice_time) in
+            enumerate(QUEUE_SETTINGS)
+            ]
+    for index, process in enumerate(processes):
+        queues[index % len(queues)].processes.append(process)
+    return queues
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'],
+                              capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(run, measure_memory : bool) -> tuple[float, int | None, int]:
+    # Every run starts cold, or the queue schedulers would reuse isolated
+    # schedules from earlier cases and skip schedule_pre
+    ql.SCHEDULE_CACHE.clear()
+    start = time.perf_counter()
+    segments = run()
+    wall = time.perf_counter() - start
+    peak = None
+    if measure_memory:
+        ql.SCHEDULE_CACHE.clear()
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return wall, peak, segments
+
+
+def cases(args) -> list[tuple[str, str, object]]:
+    selected = []
+    for key, process_scheduler in pl.PROCESS_SCHEDULERS_DICT.items():
+        if not args.schedulers or key in args.schedulers:
+            selected.append(('process', key, process_scheduler))
+    for key, queue_scheduler in ql.QUEUE_SCHEDULERS_DICT.items():
+        if not args.schedulers or key in args.schedulers:
+            selected.append(('queue', key, queue_scheduler))
+    return selected
+
+
+def compare(results : list[dict], baseline_path : str):
+    with open(baseline_path) as file:
+        baseline = json.load(file)
+
+    def case_key(result):
+        return (result['kind'], result['scheduler'], result['scale'],
+                result['arrivals'], result['bursts'])
+
+    old_results = {case_key(result): result for result in baseline['results']}
+    print(f'\nCompared with {baseline_path} '
+          f'({baseline["meta"].get("commit")}):', file=sys.stderr)
+    for result in results:
+        old_result = old_results.get(case_key(result))
+        if old_result is None:
+            continue
+        speedup = old_result['wall_seconds'] / max(result['wall_seconds'],
+                                                   1e-9)
+        print(f'{result["scheduler"]:>10} {result["scale"]:>8} '
+              f'{result["arrivals"]:>6} {result["bursts"]:>5} '
+              f'{speedup:>8.2f}x', file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='QueueSim scheduler '
+                                     'benchmarks')
+    parser.add_argument('--scales', type=int, nargs='+', default=SCALES)
+    parser.add_argument('--schedulers', nargs='+', default=[],
+                        help='only run these PROCESS_SCHEDULERS_DICT or '
+                        'QUEUE_SCHEDULERS_DICT keys')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip the tracemalloc run')
+    parser.add_argument('-o', '--output', default='-',
+                        help='JSON results file, - for stdout (default)')
+    parser.add_argument('--compare', metavar='PATH',
+                        help='earlier JSON results to print speedups against')
+    args = parser.parse_args()
+
+    results = []
+    print(f'{"scheduler":>10} {"scale":>8} {"arr":>6} {"burst":>5} '
+          f'{"seconds":>9} {"peak MB":>8} {"segments/s":>11}',
+          file=sys.stderr)
+    for scale in args.scales:
+        for arrivals in ARRIVALS:
+            for bursts in BURSTS:
+                processes = make_processes(scale, arrivals, bursts)
+                for kind, key, scheduler in cases(args):
+                    if kind == 'process':
+                        def run():
+                            return len(scheduler.schedule(processes, QUANTUM))
+                    else:
+                        queues = make_queues(processes)
+
+                        def run():
+                            return len(scheduler.schedule(queues)[0]
+                                       .schedule_list)
+                    wall, peak, segments = measure(run, not args.no_memory)
+                    result = dict(kind=kind, scheduler=key, scale=scale,
+                                  arrivals=arrivals, bursts=bursts,
+                                  wall_seconds=wall, peak_bytes=peak,
+                                  segments=segments,
+                                  segments_per_second=segments / wall
+                                  if wall else None)
+                    results.append(result)
+                    peak_text = '-' if peak is None else f'{peak / 1e6:.1f}'
+                    print(f'{key:>10} {scale:>8} {arrivals:>6} {bursts:>5} '
+                          f'{wall:>9.3f} {peak_text:>8} '
+                          f'{segments / max(wall, 1e-9):>11.0f}',
+                          file=sys.stderr)
+
+    report = dict(
+            meta=dict(commit=git_commit(), python=platform.python_version(),
+                      platform=platform.platform(), time=time.time(),
+                      quantum=QUANTUM),
+            results=results,
+            )
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=1)
+        print()
+    else:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=1)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,279 @@
+"""
+@file binary_logic.py
+@date Oct 18, 2026
+
+Fixed-width binary files for very large workloads and schedules.
+
+A file is an 8 byte magic followed by records of little-endian 64-bit
+integers, so the number of records follows from the file size and record
+``i`` sits at a known offset:
+
+- process files (magic ``QSIMPRC1``): id, arrival, burst, priority,
+  queue id
+- segment files (magic ``QSIMSEG1``): process id, start, duration
+
+Processes are named ``P<id>``. Readers memory-map the file and expose
+the records as zero-copy views, so opening one takes the same time
+whatever its size; Process and Schedule objects are only built for the
+records that are actually read::
+
+    with ProcessFile('workload.qsp') as workload, \\
+            SegmentWriter('cpu.qss') as writer:
+        writer.write_schedules(queue_scheduler.stream(
+            queues, workload.arrivals(queues)))
+
+Writers only ever append, so a file can be extended by later runs.
+"""
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+import mmap
+import os
+import sys
+import weakref
+import process_logic as pl
+import queue_logic as ql
+
+
+PROCESS_MAGIC = b'QSIMPRC1'
+SEGMENT_MAGIC = b'QSIMSEG1'
+PROCESS_FIELDS = 5
+SEGMENT_FIELDS = 3
+_HEADER_SIZE = 8
+_FIELD_SIZE = 8
+# Records buffered by a writer before they are written out
+_WRITE_BUFFER = 1 << 16
+
+
+def process_name(process_id : int) -> str:
+    return f'P{process_id}'
+
+
+def process_id(process_name : str) -> int:
+    if not (process_name.startswith('P') and process_name[1:].isdigit()):
+        raise ValueError(f'{process_name!r} is not named P<id> and cannot be '
+                         'written to a binary file')
+    return int(process_name[1:])
+
+
+class _RecordFile:
+    """Memory-mapped, read-only file of fixed-width records."""
+    def __init__(self, path : str, magic : bytes, fields : int):
+        if sys.byteorder != 'little':
+            raise ValueError('Binary files can only be mapped on '
+                             'little-endian machines')
+        self.fields_per_record = fields
+        self.file = open(path, 'rb')
+        try:
+            size = os.fstat(self.file.fileno()).st_size
+            if size < _HEADER_SIZE or self.file.read(_HEADER_SIZE) != magic:
+                raise ValueError(f'{path} is not a {magic.decode()} file')
+            if (size - _HEADER_SIZE) % (fields * _FIELD_SIZE):
+                raise ValueError(f'{path} ends with a partial record')
+            self.map = mmap.mmap(self.file.fileno(), 0,
+                                 access=mmap.ACCESS_READ) \
+                    if size > _HEADER_SIZE else None
+        except BaseException:
+            self.file.close()
+            raise
+        # One flat view of every field of every record
+        self.fields = memoryview(self.map)[_HEADER_SIZE:].cast('q') \
+                if self.map is not None else memoryview(array('q'))
+        # Views handed out by column(), released by close()
+        self.views : list[weakref.ref[memoryview]] = []
+
+    def __len__(self) -> int:
+        return len(self.fields) // self.fields_per_record
+
+    def column(self, field : int) -> memoryview:
+        """Zero-copy view of one field of every record. Closing the file
+        releases it, so it must not be used afterwards."""
+        view = self.fields[field::self.fields_per_record]
+        self.views.append(weakref.ref(view))
+        return view
+
+    def record(self, index : int) -> tuple[int, ...]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('record index out of range')
+        start = index * self.fields_per_record
+        with self.fields[start:start + self.fields_per_record] as view:
+            return tuple(view)
+
+    def close(self):
+        """Release the views from column() and unmap the file. Fails if
+        other buffers made from those views (memoryview slices, numpy
+        arrays) are still alive."""
+        try:
+            for reference in self.views:
+                view = reference()
+                if view is not None:
+                    view.release()
+            self.fields.release()
+            if self.map is not None:
+                self.map.close()
+        except BufferError as error:
+            raise BufferError(f'{self.file.name} is still in use by a '
+                              'buffer made from one of its columns; '
+                              'release it before closing the file') \
+                    from error
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+class ProcessFile(_RecordFile):
+    def __init__(self, path : str):
+        super().__init__(path, PROCESS_MAGIC, PROCESS_FIELDS)
+
+    def processes(self) -> 'ProcessView':
+        return ProcessView(self)
+
+    def arrivals(self, queues : list[ql.Queue]
+                 ) -> Iterator[tuple[ql.Queue, pl.Process]]:
+        """(queue, process) pairs in file order, each process in the
+        queue its queue id indexes, ready for QueueScheduler.stream."""
+        for index in range(len(self)):
+            process_id, arrival, burst, priority, queue_id = \
+                    self.record(index)
+            yield queues[queue_id], pl.Process(
+                    name=process_name(process_id), arrival=arrival,
+                    burst=burst, priority=priority)
+
+
+class ProcessView(Sequence):
+    """The processes of a ProcessFile as a read-only sequence, building
+    Process objects as they are read."""
+    __slots__ = ('file',)
+
+    def __init__(self, file : ProcessFile):
+        self.file = file
+
+    def __len__(self) -> int:
+        return len(self.file)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        process_id, arrival, burst, priority, _ = self.file.record(index)
+        return pl.Process(name=process_name(process_id), arrival=arrival,
+                          burst=burst, priority=priority)
+
+
+class SegmentFile(_RecordFile):
+    def __init__(self, path : str):
+        super().__init__(path, SEGMENT_MAGIC, SEGMENT_FIELDS)
+
+    def schedules(self) -> 'SegmentView':
+        return SegmentView(self)
+
+
+class SegmentView(Sequence):
+    """The segments of a SegmentFile as a read-only sequence of
+    Schedule objects."""
+    __slots__ = ('file',)
+
+    def __init__(self, file : SegmentFile):
+        self.file = file
+
+    def __len__(self) -> int:
+        return len(self.file)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return pl.ScheduleList(self[i] for i in range(len(self))[index])
+        process_id, start, duration = self.file.record(index)
+        return pl.Schedule(process_name=process_name(process_id),
+                           start=start, duration=duration)
+
+
+class _RecordWriter:
+    """Appends fixed-width records to a file, writing the magic first if
+    the file is new."""
+    def __init__(self, path : str, magic : bytes, fields : int):
+        if sys.byteorder != 'little':
+            raise ValueError('Binary files can only be written on '
+                             'little-endian machines')
+        self.fields_per_record = fields
+        self.file = open(path, 'ab')
+        try:
+            size = self.file.tell()
+            if size == 0:
+                self.file.write(magic)
+            else:
+                with open(path, 'rb') as existing:
+                    if existing.read(_HEADER_SIZE) != magic:
+                        raise ValueError(f'{path} is not a {magic.decode()} '
+                                         'file')
+                if (size - _HEADER_SIZE) % (fields * _FIELD_SIZE):
+                    raise ValueError(f'{path} ends with a partial record')
+        except BaseException:
+            self.file.close()
+            raise
+        self.buffer = array('q')
+
+    def write_record(self, *fields : int):
+        self.buffer.extend(fields)
+        if len(self.buffer) >= _WRITE_BUFFER * self.fields_per_record:
+            self.flush()
+
+    def flush(self):
+        self.buffer.tofile(self.file)
+        del self.buffer[:]
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+class ProcessWriter(_RecordWriter):
+    def __init__(self, path : str):
+        super().__init__(path, PROCESS_MAGIC, PROCESS_FIELDS)
+
+    def write(self, process : pl.Process, queue_id : int):
+        self.write_record(process_id(process.name), process.arrival,
+                          process.burst, process.priority, queue_id)
+
+    def write_queues(self, queues : list[ql.Queue]):
+        """Write the processes of every queue, in arrival order so the
+        file can be streamed."""
+        pairs = [(process, queue_id) for queue_id, queue in enumerate(queues)
+                 for process in queue.processes]
+        pairs.sort(key=lambda pair: pair[0].arrival)
+        for process, queue_id in pairs:
+            self.write(process, queue_id)
+
+
+class SegmentWriter(_RecordWriter):
+    def __init__(self, path : str):
+        super().__init__(path, SEGMENT_MAGIC, SEGMENT_FIELDS)
+
+    def write(self, schedule : pl.Schedule):
+        self.write_record(process_id(schedule.process_name), schedule.start,
+                          schedule.duration)
+
+    def write_schedules(self, schedules : Iterable[pl.Schedule]):
+        """Append segments from any iterable, including the lazy ones of
+        the ``stream`` methods."""
+        if isinstance(schedules, pl.ScheduleList):
+            # Parse every name once, not once per segment
+            ids = [process_id(name) for name in schedules.names]
+            for index, start, duration in zip(
+                    schedules.process_ids, schedules.starts,
+                    schedules.durations):
+                self.write_record(ids[index], start, duration)
+            return
+        for schedule in schedules:
+            self.write(schedule)
@@ -0,0 +1,129 @@
+"""
+@file columnar_logic.py
+@date Oct 18, 2026
+
+Columnar workloads: arrival, burst and priority live in NumPy arrays and
+processes are referred to by integer IDs (their row), so millions of
+processes cost a few bytes each instead of a dataclass instance each.
+
+This module needs NumPy; the rest of QueueSim does not import it.
+"""
+
+from dataclasses import dataclass
+import numpy as np
+import process_logic as pl
+
+
+@dataclass
+class ColumnarWorkload:
+    arrival : np.ndarray
+    burst : np.ndarray
+    priority : np.ndarray
+    # Name of every process ID; None means the default names P1, P2, ...
+    names : list[str] | None = None
+
+    def __len__(self) -> int:
+        return len(self.arrival)
+
+    def name(self, process_id : int) -> str:
+        if self.names is None:
+            return f'P{process_id + 1}'
+        return self.names[process_id]
+
+    @staticmethod
+    def from_processes(processes : list[pl.Process]) -> 'ColumnarWorkload':
+        count = len(processes)
+        return ColumnarWorkload(
+                arrival=np.fromiter((process.arrival for process in processes),
+                                    dtype=np.int64, count=count),
+                burst=np.fromiter((process.burst for process in processes),
+                                  dtype=np.int64, count=count),
+                priority=np.fromiter((process.priority for process in
+                                      processes), dtype=np.int64, count=count),
+                names=[process.name for process in processes],
+                )
+
+    def to_processes(self) -> list[pl.Process]:
+        return [
+                pl.Process(name=self.name(process_id), arrival=arrival,
+                           burst=burst, priority=priority)
+                for process_id, (arrival, burst, priority) in enumerate(zip(
+                    self.arrival.tolist(), self.burst.tolist(),
+                    self.priority.tolist()))
+                ]
+
+
+@dataclass
+class ColumnarSchedule:
+    process_id : np.ndarray
+    start : np.ndarray
+    duration : np.ndarray
+    workload : ColumnarWorkload
+
+    def __len__(self) -> int:
+        return len(self.process_id)
+
+    def end(self) -> np.ndarray:
+        return self.start + self.duration
+
+    @staticmethod
+    def from_schedules(schedules : list[pl.Schedule],
+                       workload : ColumnarWorkload) -> 'ColumnarSchedule':
+        if workload.names is None:
+            ids = {workload.name(process_id): process_id
+                   for process_id in range(len(workload))}
+        else:
+            ids = {name: process_id for process_id, name in
+                   enumerate(workload.names)}
+        count = len(schedules)
+        return ColumnarSchedule(
+                process_id=np.fromiter((ids[schedule.process_name] for
+                                        schedule in schedules),
+                                       dtype=np.int64, count=count),
+                start=np.fromiter((schedule.start for schedule in schedules),
+                                  dtype=np.int64, count=count),
+                duration=np.fromiter((schedule.duration for schedule in
+                                      schedules), dtype=np.int64, count=count),
+                workload=workload,
+                )
+
+    def to_schedules(self) -> list[pl.Schedule]:
+        return [
+                pl.Schedule(process_name=self.workload.name(process_id),
+                            start=start, duration=duration)
+                for process_id, start, duration in zip(
+                    self.process_id.tolist(), self.start.tolist(),
+                    self.duration.tolist())
+                ]
+
+
+def fcfs_schedule(workload : ColumnarWorkload) -> ColumnarSchedule:
+    """Vectorized FCFSScheduler.
+
+    FCFS runs processes in stable arrival order, so with ``C`` the running
+    sum of bursts in that order, process ``i`` ends at
+    ``C[i] + max(0, max(arrival[j] - C[j - 1] for j <= i))``.
+    """
+    order = np.argsort(workload.arrival, kind='stable')
+    order = order[workload.burst[order] > 0]
+    arrival = workload.arrival[order]
+    burst = workload.burst[order]
+    cumulative = np.cumsum(burst)
+    slack = np.maximum.accumulate(arrival - (cumulative - burst))
+    end = cumulative + np.maximum(slack, 0)
+    return ColumnarSchedule(process_id=order, start=end - burst,
+                            duration=burst, workload=workload)
+
+
+def schedule(workload : ColumnarWorkload, process_scheduler_key : str,
+             quantum : int) -> ColumnarSchedule:
+    """Run a PROCESS_SCHEDULERS_DICT entry on a columnar workload.
+
+    Uses a vectorized fast path when there is one and falls back to the
+    regular scheduler otherwise.
+    """
+    if process_scheduler_key == 'FCFS':
+        return fcfs_schedule(workload)
+    process_scheduler = pl.PROCESS_SCHEDULERS_DICT[process_scheduler_key]
+    schedules = process_scheduler.schedule(workload.to_processes(), quantum)
+    return ColumnarSchedule.from_schedules(schedules, workload)
@@ -0,0 +1,120 @@
+"""
+@file generator_logic.py
+@date Oct 18, 2026
+
+Seeded, lazy workload generation. Processes are yielded one at a time, so
+10⁷ of them can be fed to a consumer in constant memory, and the same seed
+always gives the same workload.
+
+Distributions are small factories returning a ``sampler(rng) -> int``::
+
+    processes = generate_processes(seed=7, arrivals=poisson_arrivals(0.2),
+                                   burst=pareto(alpha=1.5, minimum=2),
+                                   priority=uniform(0, 9), count=10_000_000)
+    for queue, process in distribute(processes, queues, seed=7): ...
+"""
+
+from typing import Callable, Iterable, Iterator
+import itertools
+import math
+import random
+import process_logic as pl
+import queue_logic as ql
+
+
+Sampler = Callable[[random.Random], int]
+# Takes its own random stream, yields non-decreasing arrival times
+ArrivalProcess = Callable[[random.Random], Iterator[int]]
+
+
+def uniform(low : int, high : int) -> Sampler:
+    return lambda rng: rng.randint(low, high)
+
+
+def exponential(mean : float, minimum : int = 1) -> Sampler:
+    return lambda rng: max(minimum, round(rng.expovariate(1 / mean)))
+
+
+def bimodal(short_mean : float, long_mean : float, long_fraction : float,
+            minimum : int = 1) -> Sampler:
+    """Exponential mix: mostly short values, with a ``long_fraction`` of
+    long ones."""
+    def sample(rng : random.Random) -> int:
+        mean = long_mean if rng.random() < long_fraction else short_mean
+        return max(minimum, round(rng.expovariate(1 / mean)))
+    return sample
+
+
+def pareto(alpha : float, minimum : int = 1,
+           maximum : int | None = None) -> Sampler:
+    """Heavy-tailed values of at least ``minimum``, optionally capped."""
+    def sample(rng : random.Random) -> int:
+        value = math.floor(minimum * rng.paretovariate(alpha))
+        return value if maximum is None else min(value, maximum)
+    return sample
+
+
+def poisson_arrivals(rate : float, start : int = 0) -> ArrivalProcess:
+    """Poisson process with ``rate`` arrivals per time unit, rounded down
+    to whole time units."""
+    def arrivals(rng : random.Random) -> Iterator[int]:
+        time = float(start)
+        while True:
+            time += rng.expovariate(rate)
+            yield math.floor(time)
+    return arrivals
+
+
+def trace_arrivals(trace : str | Iterable[int]) -> ArrivalProcess:
+    """Replay arrival times from an iterable or from a file holding one
+    integer per line; the file is read lazily."""
+    def arrivals(rng : random.Random) -> Iterator[int]:
+        if not isinstance(trace, str):
+            yield from trace
+            return
+        with open(trace) as file:
+            for line in file:
+                line = line.strip()
+                if line:
+                    yield int(line)
+    return arrivals
+
+
+def generate_processes(seed : int, arrivals : ArrivalProcess,
+                       burst : Sampler, priority : Sampler = uniform(0, 0),
+                       count : int | None = None, first_index : int = 1
+                       ) -> Iterator[pl.Process]:
+    """Lazily yield processes named P<first_index>, P<first_index + 1>, ...
+
+    Arrivals, bursts and priorities each get their own random stream, so
+    changing one distribution does not reshuffle the others. The stream
+    ends after ``count`` processes or when the arrivals run out.
+    """
+    arrival_iterator = arrivals(random.Random(f'{seed}/arrival'))
+    burst_rng = random.Random(f'{seed}/burst')
+    priority_rng = random.Random(f'{seed}/priority')
+    indices = itertools.count(first_index) if count is None else \
+            range(first_index, first_index + count)
+    for index, arrival in zip(indices, arrival_iterator):
+        yield pl.Process(name=f'P{index}', arrival=arrival,
+                         burst=burst(burst_rng),
+                         priority=priority(priority_rng))
+
+
+def distribute(processes : Iterable[pl.Process], queues : list[ql.Queue],
+               seed : int, weights : list[float] | None = None
+               ) -> Iterator[tuple[ql.Queue, pl.Process]]:
+    """Lazily pair every process with a queue, at random with the given
+    weights (uniform by default)."""
+    rng = random.Random(f'{seed}/queue')
+    cumulative_weights = list(itertools.accumulate(
+        weights if weights is not None else [1] * len(queues)))
+    for process in processes:
+        yield rng.choices(queues, cum_weights=cumulative_weights)[0], process
+
+
+def fill_queues(processes : Iterable[pl.Process], queues : list[ql.Queue],
+                seed : int, weights : list[float] | None = None):
+    """Append the processes to the queues they are distributed to."""
+    for queue, process in distribute(processes, queues, seed, weights):
+        queue.processes.append(process)
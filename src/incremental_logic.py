@@ -0,0 +1,259 @@
+"""
+@file incremental_logic.py
+@date Oct 18, 2026
+
+Incremental re-simulation. IncrementalSimulator remembers the last run of
+every engine together with checkpoints of its state; after an edit, each
+engine resumes from its last checkpoint that only depends on input the
+edit left alone, and the results start as copies of the unchanged prefix
+of the previous ones::
+
+    simulator = IncrementalSimulator()
+    timelines = simulator.schedule(queue_scheduler, queues)
+    queues[0].processes[5].burst += 10
+    timelines = simulator.schedule(queue_scheduler, queues) # mostly reused
+
+Results of earlier runs are never modified.
+"""
+
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Iterator, Sequence
+import instrument_logic
+import process_logic as pl
+import queue_logic as ql
+
+
+# Engine loop iterations between checkpoints, until there are too many
+CHECKPOINT_INTERVAL = 1024
+# Beyond this many checkpoints per engine every other one is dropped and
+# the interval doubles, bounding the memory spent on engine states
+MAX_CHECKPOINTS = 64
+# Items compared at once when looking for the first difference
+_CHUNK = 4096
+
+# Called as progress(stage, simulated time, segments so far) at every
+# checkpoint; it may raise to abandon the run
+Progress = Callable[[str, int, int], None]
+
+
+@dataclass(slots=True)
+class _EngineRun:
+    """What is kept of the last run of one engine."""
+    settings : tuple
+    # The input the engine was fed, in the order it consumed it
+    inputs : Any
+    schedules : pl.ScheduleList
+    # (consumed, engine state, schedules length, duration of the last
+    # schedule), oldest first
+    checkpoints : list[tuple[Any, tuple, int, int]]
+    interval : int
+
+
+class _CheckpointRecorder:
+    """Checkpoint callback keeping engine states next to the length of
+    the schedule list they were taken at."""
+    def __init__(self, schedules : pl.ScheduleList,
+                 checkpoints : list[tuple[Any, tuple, int, int]],
+                 interval : int, max_checkpoints : int, stage : str,
+                 progress : Progress | None):
+        self.schedules = schedules
+        self.checkpoints = checkpoints
+        self.interval = interval
+        self.max_checkpoints = max_checkpoints
+        self.stage = stage
+        self.progress = progress
+
+    def __call__(self, consumed : int | list[int], state : tuple) -> int:
+        schedules = self.schedules
+        # Merging schedulers may still extend the last schedule, so its
+        # current duration is kept as well
+        self.checkpoints.append((consumed, state, len(schedules),
+                                 schedules.durations[-1] if schedules else 0))
+        if len(self.checkpoints) > self.max_checkpoints:
+            del self.checkpoints[1::2]
+            self.interval *= 2
+        if self.progress is not None:
+            # Every engine state starts with its current time
+            self.progress(self.stage, state[0], len(schedules))
+        return self.interval
+
+
+def _shared_prefix(old : Sequence, new : Sequence) -> int:
+    """Number of leading items two sequences share, or one more than
+    their length if they are equal: pulling the end of an unchanged input
+    is safe as well."""
+    length = min(len(old), len(new))
+    index = 0
+    while index < length:
+        end = min(index + _CHUNK, length)
+        if old[index:end] != new[index:end]:
+            return next(position for position in range(index, end)
+                        if old[position] != new[position])
+        index = end
+    return length + 1 if len(old) == len(new) else length
+
+
+def _shared_schedules(old : pl.ScheduleList, new : pl.ScheduleList) -> int:
+    """_shared_prefix of two schedule lists, comparing their arrays."""
+    common = min(len(old.names), len(new.names))
+    if old.names[:common] != new.names[:common]:
+        # Process ids are not comparable; only happens after a from
+        # scratch run, which rarely shares much anyway
+        return 0
+    return min(_shared_prefix(old.process_ids, new.process_ids),
+               _shared_prefix(old.starts, new.starts),
+               _shared_prefix(old.durations, new.durations))
+
+
+def _is_covered(consumed : int | list[int], shared : int | list[int]
+                ) -> bool:
+    if isinstance(consumed, int):
+        return consumed <= shared
+    return all(count <= limit for count, limit in zip(consumed, shared))
+
+
+class IncrementalSimulator:
+    def __init__(self, interval : int = CHECKPOINT_INTERVAL,
+                 max_checkpoints : int = MAX_CHECKPOINTS):
+        self.interval = interval
+        self.max_checkpoints = max_checkpoints
+        # Isolated engine runs and their timelines, by queue name
+        self.queue_runs : dict[str, _EngineRun] = {}
+        self.queue_timelines : dict[str, ql.ScheduleTimeline] = {}
+        self.cpu_run : _EngineRun | None = None
+
+    def schedule(self, queue_scheduler : ql.QueueScheduler,
+                 queues : list[ql.Queue], progress : Progress | None = None
+                 ) -> list[ql.ScheduleTimeline]:
+        """Same result as ``queue_scheduler.schedule(queues)``, reusing as
+        much of the previous call as the edits since then allow.
+
+        If ``progress`` raises, the exception propagates and the engines
+        that did finish are still reused by the next call.
+        """
+        schedules_dict : dict[ql.Queue, pl.ScheduleList] = {}
+        timelines = []
+        queue_runs = {}
+        queue_timelines = {}
+        for queue in queues:
+            old_run = self.queue_runs.get(queue.name)
+            queue_run = queue_runs[queue.name] = self._run_queue(
+                    queue, old_run, progress)
+            schedules_dict[queue] = queue_run.schedules
+            timeline = self.queue_timelines.get(queue.name)
+            if queue_run is not old_run or timeline is None:
+                timeline = ql.ScheduleTimeline(
+                        name=f'Isolated {queue.name}',
+                        processes=queue.processes,
+                        schedule_list=queue_run.schedules)
+            queue_timelines[queue.name] = timeline
+            timelines.append(timeline)
+            # Keep what is done so far if a later engine is abandoned
+            self.queue_runs[queue.name] = queue_run
+            self.queue_timelines[queue.name] = timeline
+        self.queue_runs = queue_runs
+        self.queue_timelines = queue_timelines
+
+        self.cpu_run = self._run_cpu(queue_scheduler, queues, schedules_dict,
+                                     progress)
+        timelines.insert(0, ql.ScheduleTimeline(
+            name='CPU', processes=ql.QueueScheduler.all_processes(queues),
+            schedule_list=self.cpu_run.schedules))
+        return timelines
+
+    def _run_queue(self, queue : ql.Queue, old_run : _EngineRun | None,
+                   progress : Progress | None) -> _EngineRun:
+        """Isolated schedule of one queue; the old run itself if nothing
+        it depends on changed."""
+        settings = (type(queue.process_scheduler), queue.quantum)
+        inputs = [(index, process.name, process.arrival, process.burst,
+                   process.priority) for index, process in
+                  pl.arrival_order(queue.processes)]
+        shared = 0
+        if old_run is not None and old_run.settings == settings:
+            shared = _shared_prefix(old_run.inputs, inputs)
+            if shared > len(inputs):
+                return old_run
+
+        def arrivals(consumed : int) -> Iterator[tuple[int, pl.Process]]:
+            # Fresh processes, so engine states never see later edits
+            for index, name, arrival, burst, priority in islice(
+                    inputs, consumed, None):
+                yield index, pl.Process(name=name, arrival=arrival,
+                                        burst=burst, priority=priority)
+
+        def runs(checkpoint, consumed, state):
+            return queue.process_scheduler.runs(arrivals(consumed),
+                                                queue.quantum, checkpoint,
+                                                state)
+
+        with instrument_logic.phase('IncrementalSimulator.queue'):
+            return self._run_engine(settings, inputs, old_run, shared, runs,
+                                    queue.process_scheduler.merges_runs, 0,
+                                    f'Isolated {queue.name}', progress)
+
+    def _run_cpu(self, queue_scheduler : ql.QueueScheduler,
+                 queues : list[ql.Queue],
+                 schedules_dict : dict[ql.Queue, pl.ScheduleList],
+                 progress : Progress | None) -> _EngineRun:
+        queue_list = list(schedules_dict.keys())
+        settings = (type(queue_scheduler), tuple(
+            (queue.name, queue.slice_time, queue.priority)
+            for queue in queue_list))
+        inputs = [schedules_dict[queue] for queue in queue_list]
+        old_run = self.cpu_run
+        shared = [0] * len(inputs)
+        if old_run is not None and old_run.settings == settings:
+            shared = [len(new_schedules) + 1 if 
+                      old_schedules is new_schedules else 
+                      _shared_schedules(old_schedules, new_schedules)
+                      for old_schedules, new_schedules in 
+                      zip(old_run.inputs, inputs)]
+
+        def runs(checkpoint, consumed, state):
+            return queue_scheduler.runs(queue_list, [
+                map(schedules.__getitem__, range(count, len(schedules)))
+                for schedules, count in zip(inputs, consumed)],
+                                        checkpoint, state)
+
+        with instrument_logic.phase('IncrementalSimulator.cpu'):
+            return self._run_engine(settings, inputs, old_run, shared, runs,
+                                    True, [0] * len(inputs), 'CPU', progress)
+
+    def _run_engine(self, settings : tuple, inputs : Any,
+                    old_run : _EngineRun | None, shared : int | list[int],
+                    runs : Callable[..., Iterator[pl.Run]], merge : bool,
+                    nothing_consumed : int | list[int], stage : str,
+                    progress : Progress | None) -> _EngineRun:
+        """Run an engine through ``runs(checkpoint, consumed, state)``,
+        resuming from the last checkpoint of ``old_run`` that consumed
+        no more than the ``shared`` input."""
+        checkpoints = []
+        interval = self.interval
+        consumed, state, schedules = nothing_consumed, None, None
+        if old_run is not None and old_run.settings == settings:
+            for position in range(len(old_run.checkpoints) - 1, -1, -1):
+                consumed, state, length, last_duration = \
+                        old_run.checkpoints[position]
+                if not _is_covered(consumed, shared):
+                    continue
+                # The engine takes this checkpoint again when it resumes
+                checkpoints = old_run.checkpoints[:position]
+                interval = old_run.interval
+                schedules = old_run.schedules.prefix(length)
+                if length:
+                    schedules.durations[-1] = last_duration
+                break
+            else:
+                consumed, state = nothing_consumed, None
+        if schedules is None:
+            schedules = pl.ScheduleList()
+
+        recorder = _CheckpointRecorder(schedules, checkpoints, interval,
+                                       self.max_checkpoints, stage, progress)
+        pl.collect_runs(runs(recorder, consumed, state), merge=merge,
+                        schedules=schedules)
+        return _EngineRun(settings=settings, inputs=inputs,
+                          schedules=schedules, checkpoints=checkpoints,
+                          interval=recorder.interval)
@@ -0,0 +1,140 @@
+"""
+@file instrument_logic.py
+@date Oct 18, 2026
+
+Optional wall time and counters for the scheduling hot paths::
+
+    with Instrumentation() as instrumentation:
+        queue_scheduler.schedule(queues)
+    print(instrumentation.format())
+
+Every ``schedule`` entry point runs inside a named phase, and the runs its
+engine yields are counted against the innermost phase: decisions (runs
+yielded), ticks stepped (time the CPU ran), idle ticks skipped (time the
+engine jumped over) and segments emitted (after merging). Phase times are
+inclusive, so ``QueueScheduler.schedule_pre`` contains the process
+scheduler phases it calls.
+
+Instrumentation is process-wide while active, including runs on other
+threads. When it is not, the hooks below return their argument or a
+shared null context, so they only cost a global lookup per call, and
+nothing per tick or per run.
+"""
+
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+
+COUNTERS = ('decisions', 'ticks', 'idle_ticks', 'segments')
+# Phase that counts made outside of any phase go to
+UNPHASED = '(none)'
+
+_NULL_PHASE = nullcontext()
+_active : 'Instrumentation | None' = None
+
+
+class Instrumentation:
+    def __init__(self):
+        # phase -> [calls, seconds]
+        self.times : dict[str, list] = defaultdict(lambda: [0, 0.0])
+        self.counters : dict[str, Counter] = defaultdict(Counter)
+        self.stack : list[str] = []
+        self.previous : Instrumentation | None = None
+
+    def __enter__(self) -> 'Instrumentation':
+        global _active
+        self.previous, _active = _active, self
+        return self
+
+    def __exit__(self, *_):
+        global _active
+        _active = self.previous
+
+    @contextmanager
+    def phase(self, name : str):
+        self.stack.append(name)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.times[name]
+            entry[0] += 1
+            entry[1] += perf_counter() - start
+            self.stack.pop()
+
+    def count(self, counter : str, amount : int = 1):
+        self.counters[self.stack[-1] if self.stack else UNPHASED][counter] \
+                += amount
+
+    def count_runs(self, runs : Iterable, start : int = 0) -> Iterator:
+        """Pass the (name, start, duration) runs of an engine through,
+        counting them. ``start`` is the time the engine starts from."""
+        counters = self.counters[self.stack[-1] if self.stack else UNPHASED]
+        decisions = ticks = idle_ticks = 0
+        end = start
+        try:
+            for run in runs:
+                decisions += 1
+                ticks += run[2]
+                if run[1] > end:
+                    idle_ticks += run[1] - end
+                end = run[1] + run[2]
+                yield run
+        finally:
+            counters['decisions'] += decisions
+            counters['ticks'] += ticks
+            counters['idle_ticks'] += idle_ticks
+
+    def totals(self) -> Counter:
+        totals = Counter()
+        for counters in self.counters.values():
+            totals.update(counters)
+        return totals
+
+    def report(self) -> list[dict]:
+        """One row per phase, in the order the phases were first
+        entered."""
+        names = list(self.times)
+        names.extend(name for name in self.counters if name not in self.times)
+        return [dict(phase=name, calls=self.times[name][0]
+                     if name in self.times else 0,
+                     seconds=self.times[name][1] if name in self.times
+                     else 0.0,
+                     **{counter: self.counters[name][counter]
+                        for counter in COUNTERS})
+                for name in names]
+
+    def format(self) -> str:
+        header = ('phase', 'calls', 'seconds') + COUNTERS
+        rows = [header] + [
+                (row['phase'], str(row['calls']), f'{row["seconds"]:.4f}',
+                 *(str(row[counter]) for counter in COUNTERS))
+                for row in self.report()]
+        widths = [max(len(row[column]) for row in rows)
+                  for column in range(len(header))]
+        return '\n'.join(
+                '  '.join(cell.ljust(width) if column == 0 else
+                          cell.rjust(width)
+                          for column, (cell, width) in
+                          enumerate(zip(row, widths)))
+                for row in rows)
+
+
+def active() -> Instrumentation | None:
+    return _active
+
+
+def phase(name : str):
+    """Context manager timing a phase, if instrumentation is active."""
+    return _NULL_PHASE if _active is None else _active.phase(name)
+
+
+def count(counter : str, amount : int = 1):
+    if _active is not None:
+        _active.count(counter, amount)
+
+
+def count_runs(runs : Iterable, start : int = 0) -> Iterable:
+    """The runs themselves, counted if instrumentation is active."""
+    return runs if _active is None else _active.count_runs(runs, start)
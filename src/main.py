@@ -5,22 +5,55 @@
 """
 
 from typing import Iterable
+import incremental_logic as il
 import main_gui
 import results_gui
 import queue_logic as ql
 import process_logic as pl
+import worker_logic as wk
+
+
+# How often the main loop checks on a running simulation
+POLL_MILLISECONDS = 50
 
 
 class QueueSim:
     def __init__(self):
-        self.main_window = main_gui.MainWindow(self.simulate)
+        # Reuses the previous run when Simulate is pressed again after edits
+        self.simulator = il.IncrementalSimulator()
+        self.worker = wk.SimulationWorker(self.simulator)
+        self.main_window = main_gui.MainWindow(self.simulate, self.cancel)
         self.main_window.mainloop()
 
     def simulate(self, queues : list[ql.Queue], 
                  queue_scheduler : ql.QueueScheduler):
-        new_window = results_gui.ResultsTopLevel(self.main_window,
-                                                 queue_scheduler.schedule(queues))
-        new_window.mainloop()
+        if self.worker.is_running():
+            return
+        self.worker.start(queue_scheduler, queues)
+        self.main_window.set_simulating(True)
+        self.main_window.after(POLL_MILLISECONDS, self.poll)
+
+    def cancel(self):
+        self.worker.cancel()
+
+    def poll(self):
+        for message in self.worker.messages():
+            if isinstance(message, wk.Progress):
+                self.main_window.show_status(
+                        f'{message.stage}: time {message.time}, '
+                        f'{message.segments} segments')
+                continue
+            self.main_window.set_simulating(False)
+            if isinstance(message, wk.Finished):
+                self.main_window.show_status('')
+                results_gui.ResultsTopLevel(self.main_window,
+                                            message.schedule_timelines)
+            elif isinstance(message, wk.Cancelled):
+                self.main_window.show_status('Cancelled')
+            else:
+                self.main_window.show_status(f'Failed: {message.error}')
+            return
+        self.main_window.after(POLL_MILLISECONDS, self.poll)
 
 
 if __name__ == '__main__':
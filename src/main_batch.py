@@ -0,0 +1,85 @@
+"""
+@file main_batch.py
+@date Oct 18, 2026
+
+Headless entry point: runs a multilevel queue scheduler over a workload
+file and writes every resulting timeline as one JSON line.
+
+Usage: python main_batch.py WORKLOAD [--scheduler NAME] [--output PATH]
+                            [--cores N [--per-core] [--work-stealing]]
+                            [--jobs N] [--profile]
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+import argparse
+import json
+import sys
+import instrument_logic
+import queue_logic as ql
+import smp_logic
+import workload_logic as wl
+
+
+def main(argv : list[str] | None = None):
+    parser = argparse.ArgumentParser(
+            description='Run QueueSim without the GUI and write the '
+            'resulting timelines as JSON Lines.')
+    parser.add_argument('workload', help='.json or .csv workload file')
+    parser.add_argument('-s', '--scheduler',
+                        choices=list(ql.QUEUE_SCHEDULERS_DICT.keys()),
+                        default=list(ql.QUEUE_SCHEDULERS_DICT.keys())[0],
+                        help='multilevel queue scheduler (default: '
+                        '%(default)s)')
+    parser.add_argument('-o', '--output', default='-',
+                        help='output file, - for stdout (default)')
+    parser.add_argument('--cores', type=int,
+                        help='simulate this many CPUs, serving the queues '
+                        'by priority (replaces --scheduler)')
+    parser.add_argument('--per-core', action='store_true',
+                        help='with --cores, give every core its own run '
+                        'queue instead of one global run queue')
+    parser.add_argument('--work-stealing', action='store_true',
+                        help='with --per-core, let idle cores take work '
+                        'from the longest run queue')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='schedule the queues in this many worker '
+                        'processes (default: %(default)s)')
+    parser.add_argument('--profile', action='store_true',
+                        help='print the time and counters of every '
+                        'scheduling phase to stderr')
+    args = parser.parse_args(argv)
+    if args.cores is not None and args.cores < 1:
+        parser.error('--cores must be at least 1')
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+
+    try:
+        queues = wl.load_workload(args.workload)
+    except (OSError, ValueError, KeyError) as error:
+        parser.error(f'cannot load {args.workload}: {error}')
+
+    queue_scheduler = ql.QUEUE_SCHEDULERS_DICT[args.scheduler]
+    if args.cores is not None:
+        queue_scheduler = smp_logic.SMPScheduler(args.cores, args.per_core,
+                                                 args.work_stealing)
+    instrumentation = instrument_logic.Instrumentation()
+    with ProcessPoolExecutor(args.jobs) if args.jobs > 1 else \
+            nullcontext() as executor:
+        with instrumentation if args.profile else nullcontext():
+            schedule_timelines = queue_scheduler.schedule(queues, executor)
+    if args.profile:
+        print(instrumentation.format(), file=sys.stderr)
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        for schedule_timeline in schedule_timelines:
+            output.write(json.dumps(wl.timeline_to_dict(schedule_timeline)))
+            output.write('\n')
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -3,12 +3,18 @@
 @author Karim M. Ali <https://github.com/kmuali>
 @date May 07, 2024
 """
+import colorsys
+import functools
+import zlib
 import tkinter as tk
 import tkinter.ttk as ttk
 import tkinter.font as font
-from typing import Iterable
+import tkinter.filedialog as filedialog
+import tkinter.messagebox as messagebox
+from typing import Callable
 import queue_logic as ql
 import process_logic as pl
+import workload_logic as wl
 
 
 RED_BG_ARGS = dict(bg='#d9a3a3', activebackground='#fbc5c5')
@@ -17,27 +23,40 @@ BLUE_BG_ARGS = dict(bg='#a9a3d3', activebackground='#cbc5f5')
 PAD_ARGS = dict(padx=8, pady=8)
 LABEL_PAD_ARGS = dict(padx=(8, 0), pady=8)
 PROCESS_FG = '#fff'
-PROCESS_BG_BLANK = 'lightgray'
-PROCESS_BG_DICT = {
-        'P1':  'darkmagenta',
-        'P2':  'darkcyan',
-        'P3':  'darkorange',
-        'P4':  'darkblue',
-        'P5':  'darkred',
-        'P6':  'darkgreen',
-        'P7':  'magenta',
-        'P8':  'mediumaquamarine',
-        'P9':  'orange',
-        'P10': 'steelblue',
-        'P11': 'tomato',
-        'P12': 'green',
-}
+TABLE_ROWS = 30 # Treeview items per table, whatever the number of rows
+WORKLOAD_FILETYPES = [('Workloads', '*.json *.csv'), ('JSON', '*.json'),
+                      ('CSV', '*.csv')]
+
+
+@functools.lru_cache(maxsize=4096)
+def process_color(process_name : str) -> str:
+    """Background color of a process, dark enough for PROCESS_FG.
+
+    Names ending in a number step around the color wheel by the golden
+    ratio, so consecutive processes get clearly different hues; other
+    names are hashed.
+    """
+    digits = process_name[len(process_name.rstrip('0123456789')):]
+    seed = int(digits) if digits else zlib.crc32(process_name.encode())
+    hue = (seed * 0.618033988749895) % 1.0
+    red, green, blue = colorsys.hsv_to_rgb(hue, 0.75, 0.65)
+    return f'#{round(red * 255):02x}{round(green * 255):02x}' \
+            f'{round(blue * 255):02x}'
+
+
+def parse_int(text : str, minimum : int, maximum : int | None = None) -> int:
+    value = int(text)
+    if value < minimum or (maximum is not None and value > maximum):
+        raise ValueError(f'{value} is out of range')
+    return value
+
 
 class MainWindow(tk.Tk):
-    def __init__(self, external_simulate):
+    def __init__(self, external_simulate, external_cancel):
         super().__init__()
 
         self.external_simulate = external_simulate
+        self.external_cancel = external_cancel
 
         self.title('QueueSim - Main')
         self.minsize(1280, 800) # WXGA - wide
@@ -53,7 +72,7 @@ class MainWindow(tk.Tk):
         self.queue_table_frame = QueueTableFrame(self)
         self.queue_table_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, **PAD_ARGS)
 
-        self.process_table_frame = ProcessTableFrame(self)
+        self.process_table_frame = ProcessTableFrame(self, self.queue_names)
         self.process_table_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, **PAD_ARGS)
 
         self.add_queue()
@@ -61,311 +80,376 @@ class MainWindow(tk.Tk):
         self.add_process()
         self.add_process()
 
-    def validate_queue_host_comboxes(self):
-        queue_names = [queue.name for queue in 
-                       self.queue_table_frame.queue_objects]
-        for process_frame in self.process_table_frame.process_frames:
-            process_frame.host_queue_combobox.configure(values=queue_names)
-            if process_frame.host_queue_var.get() not in queue_names:
-                process_frame.host_queue_var.set(queue_names[-1])
+    def queue_names(self) -> list[str]:
+        return [queue.name for queue in self.queue_table_frame.queue_objects]
+
+    def validate_process_hosts(self):
+        queue_names = self.queue_names()
+        process_hosts = self.process_table_frame.process_hosts
+        for index, host in enumerate(process_hosts):
+            if host not in queue_names:
+                process_hosts[index] = queue_names[-1]
+        self.process_table_frame.table.refresh()
 
     def add_queue(self):
         self.queue_table_frame.add_queue()
-        self.validate_queue_host_comboxes()
+        self.validate_process_hosts()
 
     def add_process(self):
-        self.process_table_frame.add_process()
-        self.validate_queue_host_comboxes()
+        self.process_table_frame.add_process(self.queue_names()[-1])
 
     def remove_queue(self):
         self.queue_table_frame.remove_queue()
-        self.validate_queue_host_comboxes()
+        self.validate_process_hosts()
 
     def remove_process(self):
         self.process_table_frame.remove_process()
-        self.validate_queue_host_comboxes()
-
-    def simulate(self, queue_scheduler : ql.QueueScheduler):
-        queue_objects : Iterable[ql.Queue] = self.queue_table_frame.queue_objects
 
+    def collect_queues(self) -> list[ql.Queue]:
+        """The queues of the table, each holding the processes hosted by
+        it."""
+        queue_objects : list[ql.Queue] = self.queue_table_frame.queue_objects
+        queues_dict = {queue_object.name: queue_object for queue_object in 
+                       queue_objects}
         for queue_object in queue_objects:
             queue_object.processes.clear()
+        for process_object, host in zip(
+                self.process_table_frame.process_objects,
+                self.process_table_frame.process_hosts):
+            queues_dict[host].processes.append(process_object)
+        return queue_objects
 
-        process_frames : Iterable[ProcessFrame] = \
-                self.process_table_frame.process_frames
-
-        for process_frame in process_frames:
-            for queue_object in queue_objects:
-                if queue_object.name == process_frame.last_valid_host_queue:
-                    queue_object.processes.append(process_frame.process_object)
-                    break
-
-        self.external_simulate(queue_objects, queue_scheduler)
-
-
-class QueueFrame(tk.LabelFrame):
-    def __init__(self, container, queue_object : ql.Queue):
-        super().__init__(container)
-
-        self.queue_object = queue_object
-
-        self.name_var = tk.StringVar(value=self.queue_object.name)
-        self.process_scheduler_var = tk.StringVar(value=
-                                                  pl.get_process_scheduler_key(
-                                          self.queue_object.process_scheduler))
-        self.priority_var = tk.IntVar(value=self.queue_object.priority)
-        self.quantum_var = tk.IntVar(value=self.queue_object.quantum)
-        self.slice_time_var = tk.IntVar(value=self.queue_object.slice_time)
-
-        self.name_var.trace_add("write", lambda *_: self.validate_queue_object())
-        self.process_scheduler_var.trace_add("write", lambda *_: self.validate_queue_object())
-        self.priority_var.trace_add("write", lambda *_: self.validate_queue_object())
-        self.quantum_var.trace_add("write", lambda *_: self.validate_queue_object())
-        self.slice_time_var.trace_add("write", lambda *_: self.validate_queue_object())
-
-        # Queue Name
-        self.name_entry = tk.Entry(self, textvariable=self.name_var,
-                                   state='readonly', width=3)
-        self.name_entry.pack(side=tk.LEFT, **PAD_ARGS)
-
-        # Separator
-        ttk.Separator(self, orient=tk.VERTICAL).pack(side=tk.LEFT, fill=tk.Y,
-                                                     expand=True)
-
-        # Process Scheduler Options
-        tk.Label(self, text='Process Scheduler:').pack(side=tk.LEFT, **LABEL_PAD_ARGS)
-        self.process_scheduler_combobox = ttk.Combobox(self,
-                               values=list(pl.PROCESS_SCHEDULERS_DICT.keys()),
-                                textvariable=self.process_scheduler_var, width=8)
-        self.process_scheduler_combobox.pack(side=tk.LEFT, **PAD_ARGS)
-
-        # Separator
-        ttk.Separator(self, orient=tk.VERTICAL).pack(side=tk.LEFT, fill=tk.Y,
-                                                     expand=True)
-
-        # Priority options
-        tk.Label(self, text='Priority:').pack(side=tk.LEFT, **LABEL_PAD_ARGS)
-        self.priority_spinbox = tk.Spinbox(self, width=3, from_=0, 
-                                           to=999, wrap=True, 
-                                           textvariable=self.priority_var)
-        self.priority_spinbox.pack(side=tk.LEFT, **PAD_ARGS)
-
-        # Separator
-        ttk.Separator(self, orient=tk.VERTICAL).pack(side=tk.LEFT, fill=tk.Y,
-                                                     expand=True)
-
-        # Slice options
-        tk.Label(self, text='Slice:').pack(side=tk.LEFT, **LABEL_PAD_ARGS)
-        self.slice_time_spinbox = tk.Spinbox(self, width=3, from_=0, 
-                                           to=999, wrap=True, 
-                                             textvariable=self.slice_time_var)
-        self.slice_time_spinbox.pack(side=tk.LEFT, **PAD_ARGS)
-
-        # Separator
-        ttk.Separator(self, orient=tk.VERTICAL).pack(side=tk.LEFT, fill=tk.Y,
-                                                     expand=True)
-
-        # Quantum options
-        tk.Label(self, text='Quantum:').pack(side=tk.LEFT, **LABEL_PAD_ARGS)
-        self.quantum_spinbox = tk.Spinbox(self, width=3, from_=0, 
-                                           to=999, wrap=True,
-                                          textvariable=self.quantum_var)
-        self.quantum_spinbox.pack(side=tk.LEFT, **PAD_ARGS)
-
-    def validate_queue_object(self):
-        if self.process_scheduler_var.get() in \
-                pl.PROCESS_SCHEDULERS_DICT.keys():
-            self.queue_object.process_scheduler = pl.PROCESS_SCHEDULERS_DICT[
-                self.process_scheduler_var.get()]
-        else:
-            self.process_scheduler_var.set(str(pl.get_process_scheduler_key(
-                self.queue_object.process_scheduler)))
+    def simulate(self, queue_scheduler : ql.QueueScheduler):
+        self.external_simulate(self.collect_queues(), queue_scheduler)
 
-        try:
-            if 0 <= self.priority_var.get() <= 999:
-                self.queue_object.priority = self.priority_var.get()
-            else:
-                self.priority_var.set(self.queue_object.priority)
-        except:
-            self.priority_var.set(self.queue_object.priority)
+    def cancel(self):
+        self.external_cancel()
 
+    def import_workload(self):
+        path = filedialog.askopenfilename(parent=self, 
+                                          filetypes=WORKLOAD_FILETYPES)
+        if not path:
+            return
         try:
-            if 1 <= self.quantum_var.get() <= 999:
-                self.queue_object.quantum = self.quantum_var.get()
-            else:
-                self.quantum_var.set(self.queue_object.quantum)
-        except:
-            self.quantum_var.set(self.queue_object.quantum)
-
+            queue_objects = wl.load_workload(path)
+            if not queue_objects:
+                raise ValueError('The workload has no queues')
+        except (OSError, ValueError, KeyError) as error:
+            messagebox.showerror('Import failed', str(error), parent=self)
+            return
+        self.queue_table_frame.set_queues(queue_objects)
+        self.process_table_frame.set_processes(
+                [process_object for queue_object in queue_objects for 
+                 process_object in queue_object.processes],
+                [queue_object.name for queue_object in queue_objects for 
+                 _ in queue_object.processes])
+
+    def export_workload(self):
+        path = filedialog.asksaveasfilename(parent=self, 
+                                            filetypes=WORKLOAD_FILETYPES,
+                                            defaultextension='.json')
+        if not path:
+            return
         try:
-            if 1 <= self.slice_time_var.get() <= 999:
-                self.queue_object.slice_time = self.slice_time_var.get()
-            else:
-                self.slice_time_var.set(self.queue_object.slice_time)
-        except:
-            self.slice_time_var.set(self.queue_object.slice_time)
-
-
-class ProcessFrame(tk.LabelFrame):
-    def __init__(self, container, process_object : pl.Process):
+            wl.dump_workload(self.collect_queues(), path)
+        except (OSError, ValueError) as error:
+            messagebox.showerror('Export failed', str(error), parent=self)
+
+    def set_simulating(self, simulating : bool):
+        self.header_frame.simulate_button.configure(
+                state=tk.DISABLED if simulating else tk.NORMAL)
+        self.header_frame.cancel_button.configure(
+                state=tk.NORMAL if simulating else tk.DISABLED)
+
+    def show_status(self, text : str):
+        self.header_frame.status_var.set(text)
+
+
+class VirtualTable(tk.Frame):
+    """Editable table over a list of rows of any length.
+
+    The Treeview only ever holds TABLE_ROWS items, which are refilled
+    from ``row_values(index)`` for the rows in view as the table scrolls.
+    Double-clicking a cell edits it in place with an entry, or with a
+    combobox for the columns in ``choices``; ``edit_row(index, column,
+    text)`` applies the edit and raises ValueError to refuse it.
+    """
+    def __init__(self, container, columns : dict[str, str],
+                 row_count : Callable[[], int],
+                 row_values : Callable[[int], tuple],
+                 edit_row : Callable[[int, str, str], None],
+                 choices : dict[str, Callable[[], list[str]]] = {},
+                 readonly : tuple[str, ...] = (),
+                 row_color : Callable[[int], str] | None = None):
         super().__init__(container)
-
-        self.process_object = process_object
-
-        self.name_var = tk.StringVar(value=self.process_object.name)
-        self.host_queue_var = tk.StringVar()
-        self.arrival_var = tk.IntVar(value=self.process_object.arrival)
-        self.burst_var = tk.IntVar(value=self.process_object.burst)
-        self.priority_var = tk.IntVar(value=self.process_object.priority)
-
-        self.name_var.trace_add("write", lambda *_: self.validate_process_object())
-        self.host_queue_var.trace_add("write", lambda *_: self.validate_process_object())
-        self.arrival_var.trace_add("write", lambda *_: self.validate_process_object())
-        self.burst_var.trace_add("write", lambda *_: self.validate_process_object())
-        self.priority_var.trace_add("write", lambda *_: self.validate_process_object())
-
-        # Process Name
-        self.name_entry = tk.Entry(self, textvariable=self.name_var,
-                                   readonlybackground=PROCESS_BG_DICT[self.process_object.name] \
-                                           if self.process_object.name in PROCESS_BG_DICT else PROCESS_BG_BLANK,
-                                   fg=PROCESS_FG, 
-                                   state='readonly', width=3)
-        self.name_entry.pack(side=tk.LEFT, **PAD_ARGS)
-
-        # Separator
-        ttk.Separator(self, orient=tk.VERTICAL).pack(side=tk.LEFT, fill=tk.Y,
-                                                     expand=True)
-
-        # Host Queue Options
-        tk.Label(self, text='Host:').pack(side=tk.LEFT, **LABEL_PAD_ARGS)
-        self.host_queue_combobox = ttk.Combobox(self,
-                                textvariable=self.host_queue_var, width=3)
-        self.host_queue_combobox.pack(side=tk.LEFT, **PAD_ARGS)
-
-        # Separator
-        ttk.Separator(self, orient=tk.VERTICAL).pack(side=tk.LEFT, fill=tk.Y,
-                                                     expand=True)
-
-        # Arrival options
-        tk.Label(self, text='Arrival:').pack(side=tk.LEFT, **LABEL_PAD_ARGS)
-        self.arrival_spinbox = tk.Spinbox(self, width=3, from_=0, 
-                                           to=999, wrap=True, 
-                                           textvariable=self.arrival_var)
-        self.arrival_spinbox.pack(side=tk.LEFT, **PAD_ARGS)
-
-        # Separator
-        ttk.Separator(self, orient=tk.VERTICAL).pack(side=tk.LEFT, fill=tk.Y,
-                                                     expand=True)
-
-        # Burst options
-        tk.Label(self, text='Burst:').pack(side=tk.LEFT, **LABEL_PAD_ARGS)
-        self.burst_spinbox = tk.Spinbox(self, width=3, from_=0, 
-                                           to=999, wrap=True, 
-                                             textvariable=self.burst_var)
-        self.burst_spinbox.pack(side=tk.LEFT, **PAD_ARGS)
-
-        # Separator
-        ttk.Separator(self, orient=tk.VERTICAL).pack(side=tk.LEFT, fill=tk.Y,
-                                                     expand=True)
-
-        # Priority options
-        tk.Label(self, text='Priority:').pack(side=tk.LEFT, **LABEL_PAD_ARGS)
-        self.priority_spinbox = tk.Spinbox(self, width=3, from_=0, 
-                                           to=999, wrap=True,
-                                          textvariable=self.priority_var)
-        self.priority_spinbox.pack(side=tk.LEFT, **PAD_ARGS)
-
-        self.last_valid_host_queue : str = self.host_queue_var.get()
-
-    def validate_process_object(self):
-        if self.host_queue_var.get() not in self.host_queue_combobox['values']:
-            self.host_queue_var.set(self.last_valid_host_queue)
+        self.columns = list(columns.keys())
+        self.row_count = row_count
+        self.row_values = row_values
+        self.edit_row = edit_row
+        self.choices = choices
+        self.readonly = readonly
+        self.row_color = row_color
+        self.offset = 0
+        self.selected : set[int] = set()
+        self.editor : tk.Widget | None = None
+        self.color_tags : set[str] = set()
+        self.refreshing = False
+
+        self.tree = ttk.Treeview(self, columns=self.columns, show='headings',
+                                 height=TABLE_ROWS)
+        for column, heading in columns.items():
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=80, anchor=tk.CENTER)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL,
+                                       command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.items = [self.tree.insert('', tk.END) for _ in range(TABLE_ROWS)]
+
+        self.tree.bind('<<TreeviewSelect>>', self.on_select)
+        self.tree.bind('<Double-1>', self.on_double_click)
+        self.tree.bind('<MouseWheel>', lambda event: self.yview(
+            'scroll', -1 if event.delta > 0 else 1, 'units'))
+        self.tree.bind('<Button-4>', lambda _: self.yview('scroll', -1, 
+                                                         'units'))
+        self.tree.bind('<Button-5>', lambda _: self.yview('scroll', 1, 
+                                                         'units'))
+
+    def refresh(self):
+        count = self.row_count()
+        self.offset = max(min(self.offset, count - len(self.items)), 0)
+        self.refreshing = True
+        visible_selection = []
+        for position, item in enumerate(self.items):
+            index = self.offset + position
+            if index >= count:
+                self.tree.detach(item)
+                continue
+            tags = ()
+            if self.row_color is not None:
+                color = self.row_color(index)
+                if color not in self.color_tags:
+                    self.tree.tag_configure(color, background=color,
+                                            foreground=PROCESS_FG)
+                    self.color_tags.add(color)
+                tags = (color,)
+            self.tree.item(item, values=self.row_values(index), tags=tags)
+            self.tree.move(item, '', position)
+            if index in self.selected:
+                visible_selection.append(item)
+        self.tree.selection_set(visible_selection)
+        self.refreshing = False
+        if count:
+            self.scrollbar.set(self.offset / count, 
+                               min(self.offset + len(self.items), count) / 
+                               count)
         else:
-            self.last_valid_host_queue = self.host_queue_var.get()
-
-        try:
-            if 0 <= self.arrival_var.get() <= 999:
-                self.process_object.arrival = self.arrival_var.get()
-            else:
-                self.arrival_var.set(self.process_object.arrival)
-        except:
-            self.arrival_var.set(self.process_object.arrival)
-
-        try:
-            if 1 <= self.burst_var.get() <= 999:
-                self.process_object.burst = self.burst_var.get()
-            else:
-                self.burst_var.set(self.process_object.burst)
-        except:
-            self.burst_var.set(self.process_object.burst)
-
+            self.scrollbar.set(0, 1)
+
+    def yview(self, *args):
+        self.close_editor()
+        if args[0] == 'moveto':
+            self.offset = int(float(args[1]) * self.row_count())
+        elif args[0] == 'scroll':
+            rows = len(self.items) if args[2] == 'pages' else 1
+            self.offset += int(args[1]) * rows
+        self.refresh()
+        return 'break'
+
+    def see(self, index : int):
+        if not self.offset <= index < self.offset + len(self.items):
+            self.offset = index - len(self.items) + 1
+        self.refresh()
+
+    def on_select(self, _):
+        if self.refreshing:
+            return
+        visible = range(self.offset, self.offset + len(self.items))
+        self.selected = {index for index in self.selected if 
+                         index not in visible}
+        self.selected.update(self.offset + self.items.index(item) for 
+                             item in self.tree.selection())
+
+    def on_double_click(self, event):
+        self.close_editor()
+        item = self.tree.identify_row(event.y)
+        column_id = self.tree.identify_column(event.x)
+        if not item or not column_id:
+            return
+        column = self.columns[int(column_id[1:]) - 1]
+        if column in self.readonly:
+            return
+        bbox = self.tree.bbox(item, column_id)
+        if not bbox:
+            return
+        x, y, width, height = bbox
+        index = self.offset + self.items.index(item)
+        text = str(self.tree.set(item, column))
+
+        if column in self.choices:
+            self.editor = ttk.Combobox(self.tree, values=self.choices[column](),
+                                       state='readonly')
+            self.editor.set(text)
+            self.editor.bind('<<ComboboxSelected>>', 
+                             lambda _: self.commit(index, column))
+        else:
+            self.editor = tk.Entry(self.tree, justify=tk.CENTER)
+            self.editor.insert(0, text)
+            self.editor.select_range(0, tk.END)
+            self.editor.bind('<Return>', lambda _: self.commit(index, column))
+            self.editor.bind('<FocusOut>', 
+                             lambda _: self.commit(index, column))
+        self.editor.bind('<Escape>', lambda _: self.close_editor())
+        self.editor.place(x=x, y=y, width=width, height=height)
+        self.editor.focus_set()
+
+    def commit(self, index : int, column : str):
+        if self.editor is None:
+            return
+        text = self.editor.get()
+        self.close_editor()
         try:
-            if 0 <= self.priority_var.get() <= 999:
-                self.process_object.priority = self.priority_var.get()
-            else:
-                self.priority_var.set(self.process_object.priority)
-        except:
-            self.priority_var.set(self.process_object.priority)
-
-
-
+            self.edit_row(index, column, text)
+        except (ValueError, KeyError):
+            self.bell()
+        self.refresh()
 
+    def close_editor(self):
+        editor, self.editor = self.editor, None
+        if editor is not None:
+            editor.destroy()
 
 
 class QueueTableFrame(tk.LabelFrame):
     def __init__(self, container):
         super().__init__(container, text='List of Queues')
-        self.queue_objects = []
-        self.queue_frames = []
+        self.queue_objects : list[ql.Queue] = []
+        self.table = VirtualTable(
+                self, dict(name='Queue', process_scheduler='Process Scheduler',
+                           priority='Priority', slice_time='Slice',
+                           quantum='Quantum'),
+                row_count=lambda: len(self.queue_objects),
+                row_values=self.row_values, edit_row=self.edit_row,
+                choices=dict(process_scheduler=lambda: list(
+                    pl.PROCESS_SCHEDULERS_DICT.keys())),
+                readonly=('name',))
+        self.table.pack(side=tk.TOP, fill=tk.BOTH, expand=True, **PAD_ARGS)
+
+    def row_values(self, index : int) -> tuple:
+        queue_object = self.queue_objects[index]
+        return (queue_object.name, 
+                pl.get_process_scheduler_key(queue_object.process_scheduler),
+                queue_object.priority, queue_object.slice_time,
+                queue_object.quantum)
+
+    def edit_row(self, index : int, column : str, text : str):
+        queue_object = self.queue_objects[index]
+        if column == 'process_scheduler':
+            queue_object.process_scheduler = pl.PROCESS_SCHEDULERS_DICT[text]
+        elif column == 'priority':
+            queue_object.priority = parse_int(text, 0, 999)
+        elif column == 'slice_time':
+            queue_object.slice_time = parse_int(text, 1)
+        elif column == 'quantum':
+            queue_object.quantum = parse_int(text, 1)
 
     def add_queue(self):
-        if len(self.queue_objects) == len(PROCESS_BG_DICT):
-            return
-        queue_object = ql.Queue(
-                name=f'Q{1 + len(self.queue_objects)}', 
-                quantum=8, 
-                priority=0,
-                slice_time=10,
-                processes=[],
-                process_scheduler=list(pl.PROCESS_SCHEDULERS_DICT.values())[0],
-                )
-        frame_object = QueueFrame(self, queue_object)
-        frame_object.pack(side=tk.TOP, fill=tk.X, **PAD_ARGS)
-        self.queue_objects.append(queue_object)
-        self.queue_frames.append(frame_object)
+        names = {queue_object.name for queue_object in self.queue_objects}
+        number = len(self.queue_objects) + 1
+        while f'Q{number}' in names:
+            number += 1
+        self.queue_objects.append(wl.make_queue(f'Q{number}'))
+        self.table.see(len(self.queue_objects) - 1)
 
     def remove_queue(self):
-        if len(self.queue_objects) <= 1:
-            return
-        self.queue_frames.pop().destroy()
-        self.queue_objects.pop()
+        """Remove the selected queues, or the last one, keeping at least
+        one."""
+        indices = self.table.selected or {len(self.queue_objects) - 1}
+        for index in sorted(indices, reverse=True):
+            if len(self.queue_objects) <= 1:
+                break
+            del self.queue_objects[index]
+        self.table.selected.clear()
+        self.table.refresh()
+
+    def set_queues(self, queue_objects : list[ql.Queue]):
+        self.queue_objects = queue_objects
+        self.table.selected.clear()
+        self.table.offset = 0
+        self.table.refresh()
 
 
 class ProcessTableFrame(tk.LabelFrame):
-    def __init__(self, container):
+    def __init__(self, container, queue_names : Callable[[], list[str]]):
         super().__init__(container, text='List of Processes')
-        self.process_objects = []
-        self.process_frames = []
-
-    def add_process(self):
-        if len(self.process_objects) == len(PROCESS_BG_DICT):
-            return
+        self.queue_names = queue_names
+        self.process_objects : list[pl.Process] = []
+        # Name of the queue hosting every process
+        self.process_hosts : list[str] = []
+        self.table = VirtualTable(
+                self, dict(name='Process', host='Host', arrival='Arrival',
+                           burst='Burst', priority='Priority'),
+                row_count=lambda: len(self.process_objects),
+                row_values=self.row_values, edit_row=self.edit_row,
+                choices=dict(host=queue_names), readonly=('name',),
+                row_color=lambda index: process_color(
+                    self.process_objects[index].name))
+        self.table.pack(side=tk.TOP, fill=tk.BOTH, expand=True, **PAD_ARGS)
+
+    def row_values(self, index : int) -> tuple:
+        process_object = self.process_objects[index]
+        return (process_object.name, self.process_hosts[index], 
+                process_object.arrival, process_object.burst,
+                process_object.priority)
+
+    def edit_row(self, index : int, column : str, text : str):
+        process_object = self.process_objects[index]
+        if column == 'host':
+            if text not in self.queue_names():
+                raise ValueError(f'Unknown queue {text!r}')
+            self.process_hosts[index] = text
+        elif column == 'arrival':
+            process_object.arrival = parse_int(text, 0)
+        elif column == 'burst':
+            process_object.burst = parse_int(text, 1)
+        elif column == 'priority':
+            process_object.priority = parse_int(text, 0, 999)
+
+    def add_process(self, host : str):
+        names = {process_object.name for process_object in 
+                 self.process_objects}
+        number = len(self.process_objects) + 1
+        while f'P{number}' in names:
+            number += 1
         process_object = pl.Process(
-                name=f'P{1 + len(self.process_objects)}', 
+                name=f'P{number}', 
                 arrival=0, 
                 burst=5,
                 priority=0,
                 )
-        frame_object = ProcessFrame(self, process_object)
-        frame_object.pack(side=tk.TOP, fill=tk.X, **PAD_ARGS)
         self.process_objects.append(process_object)
-        self.process_frames.append(frame_object)
+        self.process_hosts.append(host)
+        self.table.see(len(self.process_objects) - 1)
 
     def remove_process(self):
-        if len(self.process_objects) <= 1:
-            return
-        self.process_frames.pop().destroy()
-        self.process_objects.pop()
+        """Remove the selected processes, or the last one, keeping at
+        least one."""
+        indices = self.table.selected or {len(self.process_objects) - 1}
+        for index in sorted(indices, reverse=True):
+            if len(self.process_objects) <= 1:
+                break
+            del self.process_objects[index]
+            del self.process_hosts[index]
+        self.table.selected.clear()
+        self.table.refresh()
+
+    def set_processes(self, process_objects : list[pl.Process], 
+                      process_hosts : list[str]):
+        self.process_objects = process_objects
+        self.process_hosts = process_hosts
+        self.table.selected.clear()
+        self.table.offset = 0
+        self.table.refresh()
 
 
 class HeaderFrame(tk.Frame):
@@ -402,6 +486,22 @@ class HeaderFrame(tk.Frame):
                                         command=self.main_window.remove_process)
         self.remove_process_button.pack(side=tk.LEFT, **LABEL_PAD_ARGS)
 
+        # Separator
+        ttk.Separator(self, orient='vertical').pack(side=tk.LEFT, fill=tk.Y,
+                                                    expand=True)
+
+        # Workload Options
+        self.workload_option_label = tk.Label(self, text='Workload:')
+        self.workload_option_label.pack(side=tk.LEFT, **LABEL_PAD_ARGS)
+        self.import_button = tk.Button(self, text='Import', 
+                                       **BLUE_BG_ARGS,
+                                       command=self.main_window.import_workload)
+        self.import_button.pack(side=tk.LEFT, **LABEL_PAD_ARGS)
+        self.export_button = tk.Button(self, text='Export', 
+                                       **BLUE_BG_ARGS,
+                                       command=self.main_window.export_workload)
+        self.export_button.pack(side=tk.LEFT, **LABEL_PAD_ARGS)
+
         # Separator
         ttk.Separator(self, orient='vertical').pack(side=tk.LEFT, fill=tk.Y,
                                                     expand=True)
@@ -428,3 +528,14 @@ class HeaderFrame(tk.Frame):
                     )
                 )
         self.simulate_button.pack(side=tk.LEFT, **PAD_ARGS)
+
+        # Cancel Button
+        self.cancel_button = tk.Button(self, text='Cancel', **RED_BG_ARGS,
+                                       state=tk.DISABLED,
+                                       command=self.main_window.cancel)
+        self.cancel_button.pack(side=tk.LEFT, **PAD_ARGS)
+
+        # Simulation Progress
+        self.status_var = tk.StringVar()
+        self.status_label = tk.Label(self, textvariable=self.status_var)
+        self.status_label.pack(side=tk.LEFT, **PAD_ARGS)
@@ -0,0 +1,57 @@
+"""
+@file main_sweep.py
+@date Oct 18, 2026
+
+Headless parameter sweep: runs a workload under every configuration of a
+JSON grid on all cores and writes one CSV row per timeline.
+
+Usage: python main_sweep.py WORKLOAD GRID [--output PATH] [--workers N]
+"""
+
+import argparse
+import csv
+import json
+import sys
+import sweep_logic as sl
+import workload_logic as wl
+
+
+def main(argv : list[str] | None = None):
+    parser = argparse.ArgumentParser(
+            description='Sweep QueueSim settings over a grid and write the '
+            'timeline metrics as CSV.')
+    parser.add_argument('workload', help='.json or .csv workload file')
+    parser.add_argument('grid', help='JSON file mapping axes to value lists')
+    parser.add_argument('-o', '--output', default='-',
+                        help='output file, - for stdout (default)')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='worker processes (default: all cores)')
+    parser.add_argument('--chunksize', type=int, default=16,
+                        help='configurations per task (default: '
+                        '%(default)s)')
+    args = parser.parse_args(argv)
+
+    try:
+        queues = wl.load_workload(args.workload)
+        with open(args.grid) as file:
+            grid = json.load(file)
+        sl.validate_grid(queues, grid)
+    except (OSError, ValueError, KeyError) as error:
+        parser.error(str(error))
+
+    output = sys.stdout if args.output == '-' else \
+            open(args.output, 'w', newline='')
+    try:
+        writer = csv.DictWriter(output, fieldnames=[*grid.keys(), 'timeline',
+                                                    *sl.METRICS])
+        writer.writeheader()
+        for row in sl.sweep(queues, grid, max_workers=args.workers,
+                            chunksize=args.chunksize):
+            writer.writerow(row)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+"""
+@file metrics_logic.py
+@date Oct 18, 2026
+
+One-pass metrics over a stream of Schedule segments: response time (first
+start - arrival), turnaround (completion - arrival) with their p95/p99,
+CPU utilization and throughput.
+
+Only processes that have arrived but not finished are kept, and
+percentiles come from fixed-size log histograms, so memory does not grow
+with the number of segments::
+
+    metrics = MetricsAccumulator()
+    for schedule in queue_scheduler.stream(
+            queues, metrics.watch_arrivals(arrivals)):
+        metrics.add(schedule)
+    print(metrics.summary())
+
+A process is complete once its segments add up to its burst. Processes
+of different queues may share a name; their runs then go to the earliest
+arrived one that has not finished.
+"""
+
+from array import array
+from bisect import insort
+from collections.abc import Iterable, Iterator
+import math
+import process_logic as pl
+import queue_logic as ql
+
+
+METRICS = ('completed', 'segments', 'avg_response', 'p95_response',
+           'p99_response', 'max_response', 'avg_turnaround',
+           'p95_turnaround', 'p99_turnaround', 'max_turnaround',
+           'utilization', 'throughput')
+
+
+class LogHistogram:
+    """Histogram of non-negative integers in a fixed number of buckets.
+
+    Values below 2**SUB_BITS get a bucket each; above that every power of
+    two is split into 2**(SUB_BITS - 1) equal buckets, so a quantile is
+    off by less than 2**-SUB_BITS of its value.
+    """
+    SUB_BITS = 7
+    __slots__ = ('counts', 'count', 'total', 'minimum', 'maximum')
+
+    def __init__(self):
+        # Enough buckets for any value below 2**63
+        self.counts = array('q', bytes(
+            8 * (LogHistogram.index((1 << 63) - 1) + 1)))
+        self.count = 0
+        self.total = 0
+        self.minimum = 0
+        self.maximum = 0
+
+    @staticmethod
+    def index(value : int) -> int:
+        shift = max(value.bit_length() - LogHistogram.SUB_BITS, 0)
+        return (shift << (LogHistogram.SUB_BITS - 1)) + (value >> shift)
+
+    @staticmethod
+    def bounds(index : int) -> tuple[int, int]:
+        """Smallest value of the bucket and its width."""
+        half = 1 << (LogHistogram.SUB_BITS - 1)
+        shift = max(index // half - 1, 0)
+        return (index - (shift << (LogHistogram.SUB_BITS - 1))) << shift, \
+                1 << shift
+
+    def add(self, value : int):
+        if value < 0:
+            raise ValueError(f'Cannot record negative value {value}')
+        self.counts[LogHistogram.index(value)] += 1
+        if not self.count or value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        self.count += 1
+        self.total += value
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q : float) -> int:
+        """Nearest-rank quantile, 0 for an empty histogram."""
+        if not self.count:
+            return 0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                low, width = LogHistogram.bounds(index)
+                return min(max(low + width // 2, self.minimum), self.maximum)
+        return self.maximum
+
+
+class MetricsAccumulator:
+    def __init__(self, processes : Iterable[pl.Process] = ()):
+        # name -> [arrival, remaining burst, started] of every unfinished
+        # process of that name, in arrival order
+        self.active : dict[str, list[list]] = {}
+        self.response = LogHistogram()
+        self.turnaround = LogHistogram()
+        self.segments = 0
+        self.busy = 0
+        self.end = 0
+        for process in processes:
+            self.register(process)
+
+    @staticmethod
+    def of(schedules : Iterable[pl.Schedule],
+           processes : Iterable[pl.Process]) -> 'MetricsAccumulator':
+        metrics = MetricsAccumulator(processes)
+        metrics.extend(schedules)
+        return metrics
+
+    def register(self, process : pl.Process):
+        # Processes without a burst are never scheduled
+        if process.burst > 0:
+            state = [process.arrival, process.burst, False]
+            states = self.active.get(process.name)
+            if states is None:
+                self.active[process.name] = [state]
+            else:
+                insort(states, state, key=lambda state: state[0])
+
+    def watch_processes(self, processes : Iterable[pl.Process]
+                        ) -> Iterator[pl.Process]:
+        """Pass a process stream through, registering every process."""
+        for process in processes:
+            self.register(process)
+            yield process
+
+    def watch_arrivals(self, arrivals : Iterable[tuple[ql.Queue, pl.Process]]
+                       ) -> Iterator[tuple[ql.Queue, pl.Process]]:
+        """Pass a (queue, process) stream through, registering every
+        process."""
+        for queue, process in arrivals:
+            self.register(process)
+            yield queue, process
+
+    def add(self, schedule : pl.Schedule):
+        self.add_run(schedule.process_name, schedule.start, schedule.duration)
+
+    def add_run(self, process_name : str, start : int, duration : int):
+        self.segments += 1
+        # Round robin emits empty segments for processes without a burst
+        if duration <= 0:
+            return
+        states = self.active.get(process_name)
+        if states is None or states[0][0] > start:
+            raise KeyError(f'{process_name} runs at {start} but is not '
+                           'registered, has not arrived or already '
+                           'finished')
+        self.busy += duration
+        if start + duration > self.end:
+            self.end = start + duration
+        # Back to back runs of processes sharing a name can be merged, so
+        # a run that outlasts its process goes on with the next one
+        while True:
+            state = states[0]
+            if not state[2]:
+                state[2] = True
+                self.response.add(start - state[0])
+            if duration < state[1]:
+                state[1] -= duration
+                return
+            start += state[1]
+            duration -= state[1]
+            self.turnaround.add(start - state[0])
+            if len(states) == 1:
+                del self.active[process_name]
+                return
+            del states[0]
+            if duration <= 0 or states[0][0] > start:
+                return
+
+    def extend(self, schedules : Iterable[pl.Schedule]):
+        if isinstance(schedules, pl.ScheduleList):
+            names = schedules.names
+            for process_id, start, duration in zip(
+                    schedules.process_ids, schedules.starts,
+                    schedules.durations):
+                self.add_run(names[process_id], start, duration)
+            return
+        for schedule in schedules:
+            self.add_run(schedule.process_name, schedule.start,
+                         schedule.duration)
+
+    def summary(self) -> dict[str, int | float]:
+        return dict(
+                completed=self.turnaround.count,
+                segments=self.segments,
+                avg_response=self.response.mean(),
+                p95_response=self.response.quantile(0.95),
+                p99_response=self.response.quantile(0.99),
+                max_response=self.response.maximum,
+                avg_turnaround=self.turnaround.mean(),
+                p95_turnaround=self.turnaround.quantile(0.95),
+                p99_turnaround=self.turnaround.quantile(0.99),
+                max_turnaround=self.turnaround.maximum,
+                utilization=self.busy / self.end if self.end else 0.0,
+                throughput=self.turnaround.count / self.end if self.end
+                        else 0.0,
+                )
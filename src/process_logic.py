@@ -5,18 +5,23 @@
 @date May 06, 2024 - May 11, 2024
 """
 
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass
+from typing import Callable
 from typing_extensions import override
-from copy import deepcopy
+from collections import deque
+import heapq
+import instrument_logic
 
-@dataclass
+@dataclass(slots=True)
 class Schedule:
     process_name : str
     start : int
     duration : int
 
 
-@dataclass
+@dataclass(slots=True)
 class Process:
     name : str
     arrival : int
@@ -24,22 +29,199 @@ class Process:
     priority : int
 
 
+class ScheduleList(Sequence):
+    """Compact, append-only sequence of schedules.
+
+    Segments are stored as (process id, start, duration) in typed arrays
+    with an interned table of process names, instead of one Schedule
+    object each. Indexing and iterating yield Schedule objects built on
+    the fly, so editing them does not change the list.
+    """
+    __slots__ = ('names', 'name_ids', 'process_ids', 'starts', 'durations')
+
+    def __init__(self, schedules : Iterable[Schedule] = ()):
+        self.names : list[str] = []
+        self.name_ids : dict[str, int] = {}
+        self.process_ids = array('q')
+        self.starts = array('q')
+        self.durations = array('q')
+        for schedule in schedules:
+            self.append(schedule)
+
+    def intern(self, process_name : str) -> int:
+        process_id = self.name_ids.get(process_name)
+        if process_id is None:
+            process_id = self.name_ids[process_name] = len(self.names)
+            self.names.append(process_name)
+        return process_id
+
+    def add(self, process_name : str, start : int, duration : int):
+        self.process_ids.append(self.intern(process_name))
+        self.starts.append(start)
+        self.durations.append(duration)
+
+    def merge(self, process_name : str, start : int, duration : int):
+        """Extend the last segment if it belongs to the same process,
+        otherwise add a new one."""
+        if self.process_ids and \
+                self.names[self.process_ids[-1]] == process_name:
+            self.durations[-1] += duration
+        else:
+            self.add(process_name, start, duration)
+
+    def append(self, schedule : Schedule):
+        self.add(schedule.process_name, schedule.start, schedule.duration)
+
+    def prefix(self, length : int) -> 'ScheduleList':
+        """Copy of the first ``length`` segments, sharing no storage with
+        this list."""
+        answer = ScheduleList()
+        answer.names = list(self.names)
+        answer.name_ids = dict(self.name_ids)
+        answer.process_ids = self.process_ids[:length]
+        answer.starts = self.starts[:length]
+        answer.durations = self.durations[:length]
+        return answer
+
+    def end_times(self) -> dict[str, int]:
+        """End time of the last segment of every process."""
+        ends : list[int | None] = [None] * len(self.names)
+        for process_id, start, duration in zip(self.process_ids, self.starts,
+                                               self.durations):
+            ends[process_id] = start + duration
+        return {name: end for name, end in zip(self.names, ends) 
+                if end is not None}
+
+    def __len__(self) -> int:
+        return len(self.process_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ScheduleList(self[i] for i in range(len(self))[index])
+        return Schedule(process_name=self.names[self.process_ids[index]],
+                        start=self.starts[index],
+                        duration=self.durations[index])
+
+    def __iter__(self) -> Iterator[Schedule]:
+        names = self.names
+        for process_id, start, duration in zip(self.process_ids, self.starts,
+                                               self.durations):
+            yield Schedule(process_name=names[process_id], start=start,
+                           duration=duration)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(
+                mine == theirs for mine, theirs in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f'ScheduleList({list(self)!r})'
+
+
+# A run is (process name, start, duration); consecutive runs of the same
+# process may still be merged into one Schedule
+Run = tuple[str, int, int]
+
+# Called by an engine as checkpoint(consumed, state) when its loop starts and
+# then again after as many iterations as the call returns. ``consumed`` counts
+# the items pulled from its input iterator(s), look-ahead included, and
+# ``state`` is a copy of the engine state that can be handed back to the
+# engine to resume, together with an iterator over the remaining input.
+Checkpoint = Callable[[int | list[int], tuple], int]
+
+
+def collect_runs(runs : Iterable[Run], merge : bool = False,
+                 schedules : ScheduleList | None = None) -> ScheduleList:
+    """Materialize the runs of an engine, merging consecutive runs of the
+    same process when ``merge`` is set. Runs are appended to
+    ``schedules`` when given."""
+    if schedules is None:
+        schedules = ScheduleList()
+    length = len(schedules)
+    end = schedules.starts[-1] + schedules.durations[-1] if length else 0
+    add = schedules.merge if merge else schedules.add
+    for process_name, start, duration in instrument_logic.count_runs(runs,
+                                                                     end):
+        add(process_name, start, duration)
+    instrument_logic.count('segments', len(schedules) - length)
+    return schedules
+
+
+def coalesce_runs(runs : Iterable[Run], merge : bool = False
+                  ) -> Iterator[Schedule]:
+    """Yield the runs of an engine as Schedule segments once they are
+    final, i.e. once a run of another process follows them."""
+    last = None
+    for process_name, start, duration in runs:
+        if merge and last is not None and last.process_name == process_name:
+            last.duration += duration
+            continue
+        if last is not None:
+            yield last
+        last = Schedule(process_name=process_name, start=start,
+                        duration=duration)
+    if last is not None:
+        yield last
+
+
+def arrival_order(processes : list[Process]
+                  ) -> list[tuple[int, Process]]:
+    """Processes with their input index, in stable arrival order."""
+    return sorted(enumerate(processes), key=lambda item: item[1].arrival)
+
+
+def checked_arrival_order(processes : Iterable[Process]
+                          ) -> Iterator[tuple[int, Process]]:
+    """Index an arrival-ordered stream of processes, refusing to go back
+    in time."""
+    last_arrival = None
+    for index, process in enumerate(processes):
+        if last_arrival is not None and process.arrival < last_arrival:
+            raise ValueError(f'{process.name} arrives at {process.arrival}, '
+                             f'before the previous process ({last_arrival}); '
+                             'streams must be in arrival order')
+        last_arrival = process.arrival
+        yield index, process
+
+
 class ProcessScheduler:
+    # Whether consecutive runs of one process become one segment
+    merges_runs = False
+    # Whether a newly ready process can take the CPU from a running one
+    preemptive = False
+
     @staticmethod
-    def schedule(processes : list[Process], quantum: int) -> list[Schedule]:
-        answer : list[Schedule] = []
+    def runs(arrivals : Iterator[tuple[int, Process]], quantum : int,
+             checkpoint : Checkpoint | None = None,
+             state : tuple | None = None) -> Iterator[Run]:
+        """The engine behind schedule and stream: takes (input index,
+        process) pairs in arrival order and yields raw runs."""
+        return iter(())
+
+    @staticmethod
+    def schedule(processes : list[Process], quantum: int) -> ScheduleList:
+        answer = ScheduleList()
         return answer
 
+    @staticmethod
+    def stream(processes : Iterable[Process], quantum: int
+               ) -> Iterator[Schedule]:
+        """Schedule an arrival-ordered stream of processes, yielding each
+        segment as soon as it is final. Memory is bounded by the ready
+        processes, not by the length of the stream."""
+        return iter(ScheduleList())
+
 class Queue:
     def __init__(self):
-        self.items = []
+        self.items = deque()
 
     def enqueue(self, item):
         self.items.append(item)
 
     def dequeue(self):
         if not self.is_empty():
-            return self.items.pop(0)
+            return self.items.popleft()
         else:
             raise IndexError("Queue is empty")
 
@@ -57,209 +239,310 @@ class Queue:
             raise IndexError("Queue is empty")
 
 
+def _run_non_preemptive(arrivals : Iterator[tuple[int, Process]],
+                        key : Callable[[Process], int],
+                        checkpoint : Checkpoint | None = None,
+                        state : tuple | None = None) -> Iterator[Run]:
+    """Event-driven engine shared by the non-preemptive schedulers.
+
+    Arrivals are admitted into a heap keyed on ``(key(process), index)``,
+    so ties are broken by input order exactly like ``min()`` over the
+    ready list did. When nothing is ready the clock jumps straight to the
+    next arrival.
+    """
+    if state is None:
+        ready : list[tuple[int, int, Process]] = []
+        current_time = 0
+        upcoming = next(arrivals, None)
+        consumed = 1
+    else:
+        current_time, consumed, upcoming, ready = state
+        ready = list(ready)
+    iterations = next_checkpoint = 0
+    while upcoming is not None or ready:
+        if checkpoint is not None and iterations == next_checkpoint:
+            next_checkpoint += checkpoint(consumed, (current_time, consumed,
+                                                     upcoming, list(ready)))
+        iterations += 1
+        if not ready and upcoming[1].arrival > current_time:
+            current_time = upcoming[1].arrival
+        while upcoming is not None and upcoming[1].arrival <= current_time:
+            index, process = upcoming
+            if process.burst > 0:
+                heapq.heappush(ready, (key(process), index, process))
+            upcoming = next(arrivals, None)
+            consumed += 1
+        if not ready:
+            continue
+        _, _, best_process = heapq.heappop(ready)
+        yield best_process.name, current_time, best_process.burst
+        current_time += best_process.burst
+
+
 class FCFSScheduler(ProcessScheduler):
+    @staticmethod
+    def key(process : Process) -> int:
+        return process.arrival
+
     @staticmethod
     @override
-    def schedule(processes : list[Process], quantum: int) -> list[Schedule]:
-        processes = deepcopy(processes)
-        schedules : list[Schedule] = []
-        current_time = 0
-        while True:
-            possible_processes = [process for process in processes if \
-                    process.burst > 0]
-
-            if not possible_processes:
-                break
-            ready_processes = [process for process in possible_processes if \
-                    process.arrival <= current_time]            
-            if not ready_processes:
-                current_time += 1
-                continue
-            best_process = min(ready_processes, 
-                               key=lambda process: process.arrival)
-            schedules.append(
-                    Schedule(
-                        process_name=best_process.name,
-                        start=current_time,
-                        duration=best_process.burst,
-                        )
-                    )
-            current_time += best_process.burst
-            best_process.burst = 0
-        return schedules
+    def runs(arrivals : Iterator[tuple[int, Process]], quantum : int,
+             checkpoint : Checkpoint | None = None,
+             state : tuple | None = None) -> Iterator[Run]:
+        return _run_non_preemptive(arrivals, FCFSScheduler.key, checkpoint,
+                                   state)
+
+    @staticmethod
+    @override
+    def schedule(processes : list[Process], quantum: int) -> ScheduleList:
+        with instrument_logic.phase('FCFSScheduler.schedule'):
+            return collect_runs(FCFSScheduler.runs(
+                iter(arrival_order(processes)), quantum))
+
+    @staticmethod
+    @override
+    def stream(processes : Iterable[Process], quantum: int
+               ) -> Iterator[Schedule]:
+        return coalesce_runs(FCFSScheduler.runs(
+            checked_arrival_order(processes), quantum))
 
 
 class LPFNonPreemptiveScheduler(ProcessScheduler):
+    @staticmethod
+    def key(process : Process) -> int:
+        return process.priority
+
     @staticmethod
     @override
-    def schedule(processes : list[Process], quantum: int) -> list[Schedule]:
-        processes = deepcopy(processes)
-        schedules : list[Schedule] = []
-        current_time = 0
-        while True:
-            possible_processes = [process for process in processes if \
-                    process.burst > 0]
-
-            if not possible_processes:
-                break
-            ready_processes = [process for process in possible_processes if \
-                    process.arrival <= current_time]            
-            if not ready_processes:
-                current_time += 1
-                continue
-            best_process = min(ready_processes, 
-                               key=lambda process: process.priority)
-            schedules.append(
-                    Schedule(
-                        process_name=best_process.name,
-                        start=current_time,
-                        duration=best_process.burst,
-                        )
-                    )
-            current_time += best_process.burst
-            best_process.burst = 0
-        return schedules
+    def runs(arrivals : Iterator[tuple[int, Process]], quantum : int,
+             checkpoint : Checkpoint | None = None,
+             state : tuple | None = None) -> Iterator[Run]:
+        return _run_non_preemptive(arrivals, LPFNonPreemptiveScheduler.key,
+                                   checkpoint, state)
+
+    @staticmethod
+    @override
+    def schedule(processes : list[Process], quantum: int) -> ScheduleList:
+        with instrument_logic.phase('LPFNonPreemptiveScheduler.schedule'):
+            return collect_runs(LPFNonPreemptiveScheduler.runs(
+                iter(arrival_order(processes)), quantum))
+
+    @staticmethod
+    @override
+    def stream(processes : Iterable[Process], quantum: int
+               ) -> Iterator[Schedule]:
+        return coalesce_runs(LPFNonPreemptiveScheduler.runs(
+            checked_arrival_order(processes), quantum))
 
 
 class SRTFNonPreemptiveScheduler(ProcessScheduler):
+    @staticmethod
+    def key(process : Process) -> int:
+        return process.burst
+
+    @staticmethod
+    @override
+    def runs(arrivals : Iterator[tuple[int, Process]], quantum : int,
+             checkpoint : Checkpoint | None = None,
+             state : tuple | None = None) -> Iterator[Run]:
+        return _run_non_preemptive(arrivals, SRTFNonPreemptiveScheduler.key,
+                                   checkpoint, state)
+
+    @staticmethod
+    @override
+    def schedule(processes : list[Process], quantum: int) -> ScheduleList:
+        with instrument_logic.phase('SRTFNonPreemptiveScheduler.schedule'):
+            return collect_runs(SRTFNonPreemptiveScheduler.runs(
+                iter(arrival_order(processes)), quantum))
+
     @staticmethod
     @override
-    def schedule(processes : list[Process], quantum: int) -> list[Schedule]:
-        processes = deepcopy(processes)
-        schedules : list[Schedule] = []
+    def stream(processes : Iterable[Process], quantum: int
+               ) -> Iterator[Schedule]:
+        return coalesce_runs(SRTFNonPreemptiveScheduler.runs(
+            checked_arrival_order(processes), quantum))
+
+
+def _run_preemptive(arrivals : Iterator[tuple[int, Process]],
+                    key : Callable[[Process, int], int],
+                    checkpoint : Checkpoint | None = None,
+                    state : tuple | None = None) -> Iterator[Run]:
+    """Event-driven engine shared by the preemptive schedulers.
+
+    Decisions are only made at arrivals and completions: the best ready
+    process, by ``(key(process, remaining), index)``, runs until the next
+    arrival or until it finishes. The running process never gets a worse
+    key while it runs, so this matches a tick-by-tick ``min()`` exactly.
+    """
+    if state is None:
+        ready : list[tuple[int, int, int, Process]] = []
         current_time = 0
-        while True:
-            possible_processes = [process for process in processes if \
-                    process.burst > 0]
-
-            if not possible_processes:
-                break
-            ready_processes = [process for process in possible_processes if \
-                    process.arrival <= current_time]            
-            if not ready_processes:
-                current_time += 1
-                continue
-            best_process = min(ready_processes, 
-                               key=lambda process: process.burst)
-            schedules.append(
-                    Schedule(
-                        process_name=best_process.name,
-                        start=current_time,
-                        duration=best_process.burst,
-                        )
-                    )
-            current_time += best_process.burst
-            best_process.burst = 0
-        return schedules
+        upcoming = next(arrivals, None)
+        consumed = 1
+    else:
+        current_time, consumed, upcoming, ready = state
+        ready = list(ready)
+    iterations = next_checkpoint = 0
+    while upcoming is not None or ready:
+        if checkpoint is not None and iterations == next_checkpoint:
+            next_checkpoint += checkpoint(consumed, (current_time, consumed,
+                                                     upcoming, list(ready)))
+        iterations += 1
+        if not ready and upcoming[1].arrival > current_time:
+            current_time = upcoming[1].arrival
+        while upcoming is not None and upcoming[1].arrival <= current_time:
+            index, process = upcoming
+            if process.burst > 0:
+                heapq.heappush(ready, (key(process, process.burst), index, 
+                                       process.burst, process))
+            upcoming = next(arrivals, None)
+            consumed += 1
+        if not ready:
+            continue
+        _, index, remaining, best_process = heapq.heappop(ready)
+        duration = remaining
+        if upcoming is not None:
+            duration = min(duration, upcoming[1].arrival - current_time)
+        yield best_process.name, current_time, duration
+        current_time += duration
+        remaining -= duration
+        if remaining > 0:
+            heapq.heappush(ready, (key(best_process, remaining), index, 
+                                   remaining, best_process))
 
 
 class LPFPreemptiveScheduler(ProcessScheduler):
+    merges_runs = True
+    preemptive = True
+
+    @staticmethod
+    def key(process : Process, remaining : int) -> int:
+        return process.priority
+
+    @staticmethod
+    @override
+    def runs(arrivals : Iterator[tuple[int, Process]], quantum : int,
+             checkpoint : Checkpoint | None = None,
+             state : tuple | None = None) -> Iterator[Run]:
+        return _run_preemptive(arrivals, LPFPreemptiveScheduler.key,
+                               checkpoint, state)
+
+    @staticmethod
+    @override
+    def schedule(processes : list[Process], quantum: int) -> ScheduleList:
+        with instrument_logic.phase('LPFPreemptiveScheduler.schedule'):
+            return collect_runs(LPFPreemptiveScheduler.runs(
+                iter(arrival_order(processes)), quantum), merge=True)
+
     @staticmethod
     @override
-    def schedule(processes : list[Process], quantum: int):
-        processes = deepcopy(processes)
-        schedules : list[Schedule] = []
-        current_time = -1
-        while True:
-            possible_processes = [process for process in processes if \
-                    process.burst > 0]
-            if not possible_processes:
-                break
-            current_time += 1
-            ready_processes = [process for process in possible_processes if \
-                    process.arrival <= current_time]            
-            if not ready_processes:
-                continue
-            best_process = min(ready_processes, 
-                            key=lambda process: process.priority)
-            best_process.burst -= 1
-            if schedules and schedules[-1].process_name == best_process.name:
-                schedules[-1].duration += 1
-            else:
-                schedules.append(
-                        Schedule(
-                            process_name=best_process.name,
-                            start=current_time,
-                            duration=1,
-                            )
-                        )
-        return schedules
+    def stream(processes : Iterable[Process], quantum: int
+               ) -> Iterator[Schedule]:
+        return coalesce_runs(LPFPreemptiveScheduler.runs(
+            checked_arrival_order(processes), quantum), merge=True)
 
 
 class SRTFPreemptiveScheduler(ProcessScheduler):
+    merges_runs = True
+    preemptive = True
+
+    @staticmethod
+    def key(process : Process, remaining : int) -> int:
+        return remaining
+
     @staticmethod
     @override
-    def schedule(processes : list[Process], quantum: int):
-        processes = deepcopy(processes)
-        schedules : list[Schedule] = []
-        current_time = -1
-        while True:
-            possible_processes = [process for process in processes if \
-                    process.burst > 0]
-            if not possible_processes:
-                break
-            current_time += 1
-            ready_processes = [process for process in possible_processes if \
-                    process.arrival <= current_time]            
-            if not ready_processes:
-                continue
-            best_process = min(ready_processes, 
-                            key=lambda process: process.burst)
-            best_process.burst -= 1
-            if schedules and schedules[-1].process_name == best_process.name:
-                schedules[-1].duration += 1
-            else:
-                schedules.append(
-                        Schedule(
-                            process_name=best_process.name,
-                            start=current_time,
-                            duration=1,
-                            )
-                        )
-        return schedules
+    def runs(arrivals : Iterator[tuple[int, Process]], quantum : int,
+             checkpoint : Checkpoint | None = None,
+             state : tuple | None = None) -> Iterator[Run]:
+        return _run_preemptive(arrivals, SRTFPreemptiveScheduler.key,
+                               checkpoint, state)
 
+    @staticmethod
+    @override
+    def schedule(processes : list[Process], quantum: int) -> ScheduleList:
+        with instrument_logic.phase('SRTFPreemptiveScheduler.schedule'):
+            return collect_runs(SRTFPreemptiveScheduler.runs(
+                iter(arrival_order(processes)), quantum), merge=True)
 
-class RRScheduler(ProcessScheduler):
     @staticmethod
     @override
-    def schedule(processes: list[Process], quantum: int) -> list[Schedule]:
-        processes = deepcopy(processes)
-        schedules: list[Schedule] = []
+    def stream(processes : Iterable[Process], quantum: int
+               ) -> Iterator[Schedule]:
+        return coalesce_runs(SRTFPreemptiveScheduler.runs(
+            checked_arrival_order(processes), quantum), merge=True)
+
+
+def _run_round_robin(arrivals : Iterator[tuple[int, Process]],
+                     quantum : int, checkpoint : Checkpoint | None = None,
+                     state : tuple | None = None) -> Iterator[Run]:
+    if state is None:
         current_time = 0
-        schedule_duration = 0
+        # Ready queue of (process, remaining burst) pairs
+        process_queue = Queue()
+        # The arrivals come nearest first; upcoming is the next process
+        # that has not arrived yet
+        upcoming = next(arrivals, None)
+        consumed = 1
+    else:
+        current_time, consumed, upcoming, items = state
         process_queue = Queue()
-        # Sort the list to make the first elements is the elements nearest 
-        # to our current time which start from zero
-        processes = sorted(processes, key=lambda process: process.arrival)
-        
-        while processes or not process_queue.is_empty():
-            while processes and processes[0].arrival <= current_time:
-                process_queue.enqueue(processes.pop(0))
-            
-            if not process_queue.is_empty():
-                current_process = process_queue.dequeue()
-                schedule_duration = min(quantum, current_process.burst)
-                if schedules and \
-                        schedules[-1].process_name == current_process.name:
-                    schedules[-1].duration += schedule_duration
-                else:
-                    schedules.append(
-                            Schedule(
-                                process_name=current_process.name,
-                                start=current_time,
-                                duration=schedule_duration,
-                                )
-                            )
-                current_time += schedule_duration
-                current_process.burst -= schedule_duration
-                while processes and processes[0].arrival <= current_time:
-                    process_queue.enqueue(processes.pop(0))
-                # Add back to the queue if burst time is remaining
-                if current_process.burst > 0:
-                    process_queue.enqueue(current_process)
-            else:
-                current_time += 1
-        return schedules
+        process_queue.items.extend(items)
+
+    iterations = next_checkpoint = 0
+    while upcoming is not None or not process_queue.is_empty():
+        if checkpoint is not None and iterations == next_checkpoint:
+            next_checkpoint += checkpoint(consumed, (
+                current_time, consumed, upcoming, 
+                list(process_queue.items)))
+        iterations += 1
+        while upcoming is not None and upcoming[1].arrival <= current_time:
+            process_queue.enqueue((upcoming[1], upcoming[1].burst))
+            upcoming = next(arrivals, None)
+            consumed += 1
+
+        if not process_queue.is_empty():
+            current_process, remaining = process_queue.dequeue()
+            schedule_duration = min(quantum, remaining)
+            yield current_process.name, current_time, schedule_duration
+            current_time += schedule_duration
+            remaining -= schedule_duration
+            while upcoming is not None and \
+                    upcoming[1].arrival <= current_time:
+                process_queue.enqueue((upcoming[1], upcoming[1].burst))
+                upcoming = next(arrivals, None)
+                consumed += 1
+            # Add back to the queue if burst time is remaining
+            if remaining > 0:
+                process_queue.enqueue((current_process, remaining))
+        else:
+            # Idle until the next arrival
+            current_time = upcoming[1].arrival
+
+
+class RRScheduler(ProcessScheduler):
+    merges_runs = True
+
+    @staticmethod
+    @override
+    def runs(arrivals : Iterator[tuple[int, Process]], quantum : int,
+             checkpoint : Checkpoint | None = None,
+             state : tuple | None = None) -> Iterator[Run]:
+        return _run_round_robin(arrivals, quantum, checkpoint, state)
+
+    @staticmethod
+    @override
+    def schedule(processes: list[Process], quantum: int) -> ScheduleList:
+        with instrument_logic.phase('RRScheduler.schedule'):
+            return collect_runs(RRScheduler.runs(
+                iter(arrival_order(processes)), quantum), merge=True)
+
+    @staticmethod
+    @override
+    def stream(processes : Iterable[Process], quantum: int
+               ) -> Iterator[Schedule]:
+        return coalesce_runs(RRScheduler.runs(
+            checked_arrival_order(processes), quantum), merge=True)
 
 
 PROCESS_SCHEDULERS_DICT = {
@@ -4,42 +4,148 @@
 @date May 06, 2024
 """
 
-from process_logic import Process, ProcessScheduler, Schedule
+from process_logic import Checkpoint, Process, ProcessScheduler, Run, \
+        Schedule, ScheduleList, coalesce_runs, collect_runs
+from collections import OrderedDict, deque
+from concurrent.futures import Executor
+from collections.abc import Iterable, Iterator, Sequence
 from typing_extensions import override
 from dataclasses import dataclass
-import copy
+from array import array
+from functools import cached_property
+import hashlib
+import heapq
+import instrument_logic
+import math
+
+
+class SchedulePyramid:
+    """Multi-resolution summary of a schedule list, for drawing it zoomed
+    out in time proportional to the pixels rather than the segments.
+
+    Level ``k`` splits time into buckets of ``bucket_width(k)`` and keeps
+    for every bucket its dominant process id (an index into ``names``, -1
+    when idle) and the fraction of the bucket that process occupies.
+    Level 0 has at most ``max_buckets`` buckets and is exact; every level
+    above merges pairs of buckets of the one below, so a process that
+    dominates neither half of a bucket is not seen there.
+    """
+    __slots__ = ('names', 'base_width', 'dominants', 'occupancies')
+
+    def __init__(self, schedules : Sequence[Schedule], 
+                 max_buckets : int = 1 << 16):
+        if not isinstance(schedules, ScheduleList):
+            schedules = ScheduleList(schedules)
+        self.names = schedules.names
+        end = schedules.starts[-1] + schedules.durations[-1] \
+                if schedules else 0
+        self.base_width = 1
+        while end > self.base_width * max_buckets:
+            self.base_width *= 2
+
+        # Level 0: time spent by each process in the current bucket
+        bucket_count = -(-end // self.base_width)
+        dominants = array('q', [-1]) * bucket_count
+        occupancies = array('d', [0.0]) * bucket_count
+        width = self.base_width
+        bucket = -1
+        totals : dict[int, int] = {}
+        for process_id, start, duration in zip(
+                schedules.process_ids, schedules.starts, schedules.durations):
+            segment_end = start + duration
+            while start < segment_end:
+                if start // width != bucket:
+                    if totals:
+                        dominant = max(totals, key=totals.__getitem__)
+                        dominants[bucket] = dominant
+                        occupancies[bucket] = totals[dominant] / width
+                    bucket = start // width
+                    totals = {}
+                piece = min(segment_end, (bucket + 1) * width) - start
+                totals[process_id] = totals.get(process_id, 0) + piece
+                start += piece
+        if totals:
+            dominant = max(totals, key=totals.__getitem__)
+            dominants[bucket] = dominant
+            occupancies[bucket] = totals[dominant] / width
+        self.dominants = [dominants]
+        self.occupancies = [occupancies]
+
+        while len(dominants) > 1:
+            dominants, occupancies = self.merge(dominants, occupancies)
+            self.dominants.append(dominants)
+            self.occupancies.append(occupancies)
+
+    @staticmethod
+    def merge(dominants : array, occupancies : array
+              ) -> tuple[array, array]:
+        """The next level up: pairs of buckets merged into one."""
+        merged_dominants = array('q')
+        merged_occupancies = array('d')
+        for index in range(0, len(dominants), 2):
+            dominant = dominants[index]
+            occupancy = occupancies[index]
+            if index + 1 < len(dominants):
+                other = dominants[index + 1]
+                other_occupancy = occupancies[index + 1]
+                if other == dominant:
+                    occupancy += other_occupancy
+                elif other_occupancy > occupancy:
+                    dominant, occupancy = other, other_occupancy
+            merged_dominants.append(dominant)
+            merged_occupancies.append(occupancy / 2)
+        return merged_dominants, merged_occupancies
+
+    def level(self, scale : float) -> int | None:
+        """Coarsest level whose buckets are at most ``scale`` time units
+        wide, or None if even level 0 is coarser."""
+        if scale < self.base_width or not self.dominants[0]:
+            return None
+        return min(int(math.log2(scale / self.base_width)), 
+                   len(self.dominants) - 1)
+
+    def bucket_width(self, level : int) -> int:
+        return self.base_width << level
 
 
 @dataclass
 class ScheduleTimeline:
     name : str
-    schedule_list : list[Schedule]
+    schedule_list : Sequence[Schedule]
     context_switches : int
     avg_wait : float
     max_wait : int
     min_wait : int
     total_time : int
-    def __init__(self, name : str, schedule_list : list[Schedule], 
+    def __init__(self, name : str, schedule_list : Sequence[Schedule], 
                  processes : list[Process]):
         self.name = name
         self.schedule_list = schedule_list
         self.context_switches = len(self.schedule_list) - 1
-        self.avg_wait = 0.0
-        self.max_wait = 0
-        self.min_wait = 1_000_000_000
-        self.total_time = 0
-        for process in processes:
-            expected_end_time = process.arrival + process.burst
-            actual_end_time = 0
-            for schedule in reversed(self.schedule_list):
-                if schedule.process_name == process.name:
-                    actual_end_time = schedule.start + schedule.duration
-                    break
-            wait = actual_end_time - expected_end_time
-            self.max_wait = max(self.max_wait, wait)
-            self.min_wait = min(self.min_wait, wait)
-            self.avg_wait += wait / len(processes)
-            self.total_time = max(self.total_time, actual_end_time)
+
+        # One forward pass; later segments overwrite earlier ones, so each
+        # process ends up with the end time of its last segment
+        if isinstance(self.schedule_list, ScheduleList):
+            end_times = self.schedule_list.end_times()
+        else:
+            end_times : dict[str, int] = {}
+            for schedule in self.schedule_list:
+                end_times[schedule.process_name] = schedule.start + \
+                        schedule.duration
+
+        waits = [end_times.get(process.name, 0) - 
+                 (process.arrival + process.burst) for process in processes]
+        self.avg_wait = sum(waits) / len(waits) if waits else 0.0
+        self.max_wait = max(0, max(waits, default=0))
+        self.min_wait = min(waits, default=0)
+        self.total_time = max((end_times.get(process.name, 0) for process 
+                               in processes), default=0)
+
+    @cached_property
+    def pyramid(self) -> SchedulePyramid:
+        """Level-of-detail summary of the schedule list, built on first
+        use."""
+        return SchedulePyramid(self.schedule_list)
 
 
 @dataclass
@@ -54,17 +160,214 @@ class Queue:
         return self.name.__hash__()
 
 
+def _pack_queue(queue : Queue) -> tuple:
+    """The content of a queue, with the process fields in typed arrays:
+    what a worker process needs to schedule it, and what its cache key
+    is hashed from."""
+    processes = queue.processes
+    return (type(queue.process_scheduler), queue.quantum, 
+            [process.name for process in processes],
+            array('q', [process.arrival for process in processes]),
+            array('q', [process.burst for process in processes]),
+            array('q', [process.priority for process in processes]))
+
+
+def _digest(packed : tuple) -> bytes:
+    scheduler_class, quantum, names, arrivals, bursts, priorities = packed
+    digest = hashlib.blake2b(digest_size=32)
+    digest.update(f'{scheduler_class.__qualname__}:{quantum}:'.encode())
+    # Name lengths keep the concatenated names unambiguous
+    digest.update(array('q', map(len, names)))
+    digest.update(''.join(names).encode('utf-8', 'surrogatepass'))
+    digest.update(arrivals)
+    digest.update(bursts)
+    digest.update(priorities)
+    return digest.digest()
+
+
+class ScheduleCache:
+    """Bounded LRU memo of isolated queue schedules.
+
+    Entries are keyed on a digest of the content of a queue: its process
+    scheduler class, quantum and the (name, arrival, burst, priority) of
+    every process, so equal queues share one isolated schedule and
+    timeline no matter which Queue and Process objects describe them,
+    without the cache keeping a copy of the workload. The cache holds
+    the schedules of at most ``max_processes`` processes; larger queues
+    are not cached at all. Cached results are shared and must not be
+    modified.
+    """
+    def __init__(self, max_processes : int = 1 << 20):
+        self.max_processes = max_processes
+        self.processes = 0
+        self.hits = 0
+        self.misses = 0
+        # key -> [schedules, {queue name: isolated timeline}, processes]
+        self.entries : OrderedDict[bytes, list] = OrderedDict()
+
+    @staticmethod
+    def key(queue : Queue) -> bytes:
+        return _digest(_pack_queue(queue))
+
+    def get(self, key : bytes) -> Sequence[Schedule] | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key : bytes, schedules : Sequence[Schedule], 
+            processes : int):
+        if processes > self.max_processes or key in self.entries:
+            return
+        self.entries[key] = [schedules, {}, processes]
+        self.processes += processes
+        while self.processes > self.max_processes:
+            self.processes -= self.entries.popitem(last=False)[1][2]
+
+    def schedule(self, queue : Queue) -> Sequence[Schedule]:
+        key = ScheduleCache.key(queue)
+        schedules = self.get(key)
+        if schedules is None:
+            schedules = queue.process_scheduler.schedule(queue.processes, 
+                                                         queue.quantum)
+            self.put(key, schedules, len(queue.processes))
+        return schedules
+
+    def schedule_all(self, queues : list[Queue], 
+                     executor : Executor | None = None
+                     ) -> list[Sequence[Schedule]]:
+        """schedule() of every queue. With an executor, the queues that
+        miss the cache are scheduled concurrently on it; results still
+        come back in queue order, once all of them are ready."""
+        if executor is None:
+            return [self.schedule(queue) for queue in queues]
+        packs = [_pack_queue(queue) for queue in queues]
+        keys = [_digest(packed) for packed in packs]
+        results : dict[bytes, Sequence[Schedule]] = {}
+        missing : dict[bytes, tuple[Queue, tuple]] = {}
+        for key, queue, packed in zip(keys, queues, packs):
+            if key in results or key in missing:
+                # Scheduled once for all queues with this content
+                self.hits += 1
+                continue
+            schedules = self.get(key)
+            if schedules is None:
+                missing[key] = queue, packed
+            else:
+                results[key] = schedules
+        for (key, (queue, _)), result in zip(missing.items(), executor.map(
+                _schedule_packed, 
+                [packed for _, packed in missing.values()])):
+            schedules = _unpack_schedules(queue, result)
+            self.put(key, schedules, len(queue.processes))
+            results[key] = schedules
+        return [results[key] for key in keys]
+
+    def timeline(self, queue : Queue, schedules : Sequence[Schedule]
+                 ) -> ScheduleTimeline:
+        """Isolated timeline of the queue, computed once per cached
+        schedule."""
+        entry = self.entries.get(ScheduleCache.key(queue))
+        if entry is None or entry[0] is not schedules:
+            return ScheduleTimeline(name=f'Isolated {queue.name}', 
+                                    processes=queue.processes, 
+                                    schedule_list=schedules)
+        timeline = entry[1].get(queue.name)
+        if timeline is None:
+            timeline = entry[1][queue.name] = ScheduleTimeline(
+                    name=f'Isolated {queue.name}', 
+                    processes=queue.processes, schedule_list=schedules)
+        return timeline
+
+    def clear(self):
+        self.entries.clear()
+        self.processes = self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def _schedule_packed(packed : tuple) -> tuple:
+    """Schedule a packed queue in a worker process. Process names go
+    back as indices into the queue's processes, so only arrays are
+    pickled."""
+    scheduler_class, quantum, names, arrivals, bursts, priorities = packed
+    schedules = scheduler_class.schedule(
+            list(map(Process, names, arrivals, bursts, priorities)), quantum)
+    # Later duplicates of a name are overwritten by earlier ones
+    first_indices = dict(zip(reversed(names), 
+                             range(len(names) - 1, -1, -1)))
+    return (array('q', [first_indices[name] for name in schedules.names]), 
+            schedules.process_ids, schedules.starts, schedules.durations)
+
+
+def _unpack_schedules(queue : Queue, packed : tuple) -> ScheduleList:
+    name_indices, process_ids, starts, durations = packed
+    schedules = ScheduleList()
+    for index in name_indices:
+        schedules.intern(queue.processes[index].name)
+    schedules.process_ids = process_ids
+    schedules.starts = starts
+    schedules.durations = durations
+    return schedules
+
+
+# Shared by QueueScheduler.schedule_pre and schedules_post
+SCHEDULE_CACHE = ScheduleCache()
+
+
 class QueueScheduler:
     @staticmethod
-    def schedule(queues : list[Queue]) -> list[ScheduleTimeline]:
+    def schedule(queues : list[Queue], executor : Executor | None = None
+                 ) -> list[ScheduleTimeline]:
         schedule_timelines = []
         return schedule_timelines
 
     @staticmethod
-    def schedule_pre(queues : list[Queue]) -> dict[Queue, list[Schedule]]:
+    def stream(queues : list[Queue], 
+               arrivals : Iterable[tuple[Queue, Process]]
+               ) -> Iterator[Schedule]:
+        """Schedule an arrival-ordered stream of (queue, process) pairs,
+        yielding CPU segments as soon as they are final.
+
+        ``queue.processes`` is ignored. Memory is bounded by the ready
+        processes plus the arrivals buffered for queues whose isolated
+        schedule has not caught up with the stream yet.
+        """
+        return iter(ScheduleList())
+
+    @staticmethod
+    def runs(queue_list : list[Queue], 
+             schedule_iterators : list[Iterator[Schedule]],
+             checkpoint : Checkpoint | None = None,
+             state : tuple | None = None) -> Iterator[Run]:
+        """The engine behind schedule and stream: merges the isolated
+        schedules of the queues into raw CPU runs."""
+        return iter(())
+
+    @staticmethod
+    def schedule_pre(queues : list[Queue], 
+                     executor : Executor | None = None
+                     ) -> dict[Queue, Sequence[Schedule]]:
+        """Isolated schedule of every queue, computed concurrently on
+        ``executor`` (e.g. a ProcessPoolExecutor) when one is given."""
+        with instrument_logic.phase('QueueScheduler.schedule_pre'):
+            return dict(zip(queues, SCHEDULE_CACHE.schedule_all(queues, 
+                                                                executor)))
+
+    @staticmethod
+    def stream_pre(queues : list[Queue], 
+                   arrivals : Iterable[tuple[Queue, Process]]
+                   ) -> dict[Queue, Iterator[Schedule]]:
+        """Streaming counterpart of schedule_pre: a lazy isolated schedule
+        for every queue, all fed from the one stream of arrivals."""
+        demultiplexer = _ArrivalDemultiplexer(queues, arrivals)
         return {
-                queue: queue.process_scheduler.schedule(
-                    queue.processes, 
+                queue: queue.process_scheduler.stream(
+                    demultiplexer.processes(queue),
                     queue.quantum
                     ) for queue in queues
                 }
@@ -77,130 +380,285 @@ class QueueScheduler:
         return ls
 
     @staticmethod
-    def schedules_post(cpu_schedules : list[Schedule], 
+    def schedules_post(cpu_schedules : Sequence[Schedule], 
                        cpu_processes : list[Process],
                        queues : list[Queue], 
-                       schedules_dict : dict[Queue, list[Schedule]]
+                       schedules_dict : dict[Queue, Sequence[Schedule]]
                        ) -> list[ScheduleTimeline]:
-        cpu_timeline = ScheduleTimeline(
-                name='CPU',
-                processes=cpu_processes,
-                schedule_list=cpu_schedules
-                )
-        ## Preparing other queues
-        timelines = [
-                ScheduleTimeline(
-                    name=f'Isolated {queue.name}', 
-                    processes=queue.processes, 
-                    schedule_list=schedules_dict[queue]
-                    ) for queue in queues
-                ]
-        timelines.insert(0, cpu_timeline)
-        return timelines
+        with instrument_logic.phase('QueueScheduler.schedules_post'):
+            cpu_timeline = ScheduleTimeline(
+                    name='CPU',
+                    processes=cpu_processes,
+                    schedule_list=cpu_schedules
+                    )
+            ## Preparing other queues
+            timelines = [
+                    SCHEDULE_CACHE.timeline(queue, schedules_dict[queue]) 
+                    for queue in queues
+                    ]
+            timelines.insert(0, cpu_timeline)
+            return timelines
+
+
+class _ArrivalDemultiplexer:
+    """Splits one arrival-ordered stream of (queue, process) pairs into a
+    stream per queue, buffering what a queue has not asked for yet."""
+    def __init__(self, queues : list[Queue], 
+                 arrivals : Iterable[tuple[Queue, Process]]):
+        self.arrivals = iter(arrivals)
+        self.buffers : dict[str, deque[Process]] = {
+                queue.name: deque() for queue in queues}
+
+    def processes(self, queue : Queue) -> Iterator[Process]:
+        buffer = self.buffers[queue.name]
+        while True:
+            if buffer:
+                yield buffer.popleft()
+                continue
+            item = next(self.arrivals, None)
+            if item is None:
+                return
+            item_queue, process = item
+            if item_queue.name == queue.name:
+                yield process
+            elif item_queue.name in self.buffers:
+                self.buffers[item_queue.name].append(process)
+            else:
+                raise ValueError(f'{process.name} arrives in unknown queue '
+                                 f'{item_queue.name}')
+
+
+def _run_slices(queue_list : list[Queue], 
+                schedule_iterators : list[Iterator[Schedule]],
+                checkpoint : Checkpoint | None = None,
+                state : tuple | None = None) -> Iterator[Run]:
+    """Event-driven time slice merge of the isolated schedules.
+
+    Each queue keeps its head segment, what is left of it and what is left
+    of its slice. The chosen queue runs until its slice runs out, its
+    segment ends or another queue becomes ready.
+    """
+    if state is None:
+        heads = [next(schedules, None) for schedules in schedule_iterators]
+        # Segments pulled from every isolated schedule, heads included
+        consumed = [1] * len(heads)
+        remaining = [head.duration if head is not None else 0 
+                     for head in heads]
+        slice_times = [queue.slice_time for queue in queue_list]
+
+        # Queues whose head segment has not started yet, by start time
+        pending = [(head.start, index) for index, head in enumerate(heads) 
+                   if head is not None]
+        heapq.heapify(pending)
+        # Ready queues with slice time left, by (slice time, index)
+        candidates : list[tuple[int, int]] = []
+        # Ready queues whose slice is used up
+        exhausted : list[int] = []
+
+        current_time = 0
+    else:
+        current_time, consumed, heads, remaining, slice_times, pending, \
+                candidates, exhausted = \
+                (state[0], *(list(item) for item in state[1:]))
+
+    iterations = next_checkpoint = 0
+    while pending or candidates or exhausted:
+        if checkpoint is not None and iterations == next_checkpoint:
+            next_checkpoint += checkpoint(list(consumed), (
+                current_time, list(consumed), list(heads), list(remaining), 
+                list(slice_times), list(pending), list(candidates), 
+                list(exhausted)))
+        iterations += 1
+        while pending and pending[0][0] <= current_time:
+            _, index = heapq.heappop(pending)
+            if slice_times[index] > 0:
+                heapq.heappush(candidates, (slice_times[index], index))
+            else:
+                exhausted.append(index)
+        if not candidates and not exhausted:
+            current_time = pending[0][0]
+            continue
+        if candidates:
+            _, best_index = heapq.heappop(candidates)
+        else: # reset slice time
+            for index in exhausted:
+                slice_times[index] = queue_list[index].slice_time
+            best_index = min(exhausted, key=lambda index: 
+                             (slice_times[index], index))
+            for index in exhausted:
+                if index != best_index and slice_times[index] > 0:
+                    heapq.heappush(candidates, (slice_times[index], index))
+            exhausted = [index for index in exhausted if 
+                         index != best_index and slice_times[index] <= 0]
+
+        duration = remaining[best_index]
+        duration = min(duration, max(slice_times[best_index], 1))
+        if pending:
+            duration = min(duration, pending[0][0] - current_time)
+        yield heads[best_index].process_name, current_time, duration
+        current_time += duration
+        slice_times[best_index] -= duration
+        remaining[best_index] -= duration
+
+        if remaining[best_index] <= 0:
+            head = heads[best_index] = next(schedule_iterators[best_index], 
+                                            None)
+            consumed[best_index] += 1
+            if head is None:
+                continue
+            remaining[best_index] = head.duration
+            if head.start > current_time:
+                heapq.heappush(pending, (head.start, best_index))
+                continue
+        if slice_times[best_index] > 0:
+            heapq.heappush(candidates, (slice_times[best_index], best_index))
+        else:
+            exhausted.append(best_index)
+
+
+def _run_priorities(queue_list : list[Queue], 
+                    schedule_iterators : list[Iterator[Schedule]],
+                    checkpoint : Checkpoint | None = None,
+                    state : tuple | None = None) -> Iterator[Run]:
+    """Event-driven priority merge of the isolated schedules.
+
+    Ready queues live in a heap keyed on (priority, index); the best head
+    segment runs until it ends or another queue becomes ready.
+    """
+    if state is None:
+        heads = [next(schedules, None) for schedules in schedule_iterators]
+        # Segments pulled from every isolated schedule, heads included
+        consumed = [1] * len(heads)
+        remaining = [head.duration if head is not None else 0 
+                     for head in heads]
+
+        # Queues whose head segment has not started yet, by start time
+        pending = [(head.start, index) for index, head in enumerate(heads) 
+                   if head is not None]
+        heapq.heapify(pending)
+        # Ready queues by (priority, index)
+        ready : list[tuple[int, int]] = []
+
+        current_time = 0
+    else:
+        current_time, consumed, heads, remaining, pending, ready = \
+                (state[0], *(list(item) for item in state[1:]))
+
+    iterations = next_checkpoint = 0
+    while pending or ready:
+        if checkpoint is not None and iterations == next_checkpoint:
+            next_checkpoint += checkpoint(list(consumed), (
+                current_time, list(consumed), list(heads), list(remaining), 
+                list(pending), list(ready)))
+        iterations += 1
+        while pending and pending[0][0] <= current_time:
+            _, index = heapq.heappop(pending)
+            heapq.heappush(ready, (queue_list[index].priority, index))
+        if not ready:
+            current_time = pending[0][0]
+            continue
+        _, best_index = ready[0]
+
+        duration = remaining[best_index]
+        if pending:
+            duration = min(duration, pending[0][0] - current_time)
+        yield heads[best_index].process_name, current_time, duration
+        current_time += duration
+        remaining[best_index] -= duration
+
+        if remaining[best_index] <= 0:
+            head = heads[best_index] = next(schedule_iterators[best_index], 
+                                            None)
+            consumed[best_index] += 1
+            if head is None:
+                heapq.heappop(ready)
+                continue
+            remaining[best_index] = head.duration
+            if head.start > current_time:
+                heapq.heappop(ready)
+                heapq.heappush(pending, (head.start, best_index))
 
 
 class SliceQueueScheduler(QueueScheduler):
     @staticmethod
     @override
-    def schedule(queues : list[Queue]) -> list[ScheduleTimeline]:
-        schedules_dict = QueueScheduler.schedule_pre(queues)
+    def runs(queue_list : list[Queue], 
+             schedule_iterators : list[Iterator[Schedule]],
+             checkpoint : Checkpoint | None = None,
+             state : tuple | None = None) -> Iterator[Run]:
+        return _run_slices(queue_list, schedule_iterators, checkpoint, state)
 
-        tmp_schedules_dict = copy.deepcopy(schedules_dict)
-        cpu_processes = QueueScheduler.all_processes(queues)
-        cpu_schedules : list[Schedule] = []
+    @staticmethod
+    @override
+    def schedule(queues : list[Queue], executor : Executor | None = None
+                 ) -> list[ScheduleTimeline]:
+        schedules_dict = QueueScheduler.schedule_pre(queues, executor)
 
-        current_time = 0
-        while True:
-            possible_queues_dict = {queue: schedules for queue, schedules in 
-                                    tmp_schedules_dict.items() if schedules}
-            if not possible_queues_dict:
-                break
-            ready_queues_dict = {queue: schedules for queue, schedules in 
-                                 possible_queues_dict.items() if 
-                                 schedules[0].start <= current_time}
-            if not ready_queues_dict:
-                current_time += 1
-                continue
-            next_queues_dict = {queue: schedules for queue, schedules 
-                                          in ready_queues_dict.items() if 
-                                          queue.slice_time > 0}
-            if not next_queues_dict: # reset slice time
-                next_queues_dict = ready_queues_dict
-                for queue in queues:
-                    for tmp_queue in next_queues_dict.keys():
-                        if queue.name == tmp_queue.name:
-                            tmp_queue.slice_time = queue.slice_time
-                            break
-            best_queue = min(
-                    next_queues_dict, 
-                    key=lambda queue: queue.slice_time
-                    )
-            best_queue.slice_time -= 1
-            best_schedule = ready_queues_dict[best_queue][0]
-            if cpu_schedules and cpu_schedules[-1].process_name == \
-                    best_schedule.process_name:
-                cpu_schedules[-1].duration += 1
-            else:
-                cpu_schedules.append(Schedule(
-                    process_name=best_schedule.process_name,
-                    start=current_time,
-                    duration=1,
-                    ))
-            best_schedule.duration -= 1
-            if best_schedule.duration == 0:
-                ready_queues_dict[best_queue].remove(best_schedule)
-            current_time += 1
+        cpu_processes = QueueScheduler.all_processes(queues)
+        queue_list = list(schedules_dict.keys())
+        with instrument_logic.phase('SliceQueueScheduler.merge'):
+            cpu_schedules = collect_runs(SliceQueueScheduler.runs(
+                queue_list, 
+                [iter(schedules_dict[queue]) for queue in queue_list]),
+                                         merge=True)
 
         return QueueScheduler.schedules_post(cpu_schedules=cpu_schedules, 
                                              cpu_processes=cpu_processes,
                                              queues=queues, 
                                              schedules_dict=schedules_dict)
 
+    @staticmethod
+    @override
+    def stream(queues : list[Queue], 
+               arrivals : Iterable[tuple[Queue, Process]]
+               ) -> Iterator[Schedule]:
+        schedules_dict = QueueScheduler.stream_pre(queues, arrivals)
+        queue_list = list(schedules_dict.keys())
+        return coalesce_runs(SliceQueueScheduler.runs(
+            queue_list, [schedules_dict[queue] for queue in queue_list]),
+                             merge=True)
+
 
 class PriorityQueueScheduler(QueueScheduler):
     @override
     @staticmethod
-    def schedule(queues : list[Queue]) -> list[ScheduleTimeline]:
-        schedules_dict = QueueScheduler.schedule_pre(queues)
+    def runs(queue_list : list[Queue], 
+             schedule_iterators : list[Iterator[Schedule]],
+             checkpoint : Checkpoint | None = None,
+             state : tuple | None = None) -> Iterator[Run]:
+        return _run_priorities(queue_list, schedule_iterators, checkpoint,
+                               state)
 
-        tmp_schedules_dict = copy.deepcopy(schedules_dict)
-        cpu_processes = QueueScheduler.all_processes(queues)
-        cpu_schedules : list[Schedule] = []
+    @override
+    @staticmethod
+    def schedule(queues : list[Queue], executor : Executor | None = None
+                 ) -> list[ScheduleTimeline]:
+        schedules_dict = QueueScheduler.schedule_pre(queues, executor)
 
-        current_time = 0
-        while True:
-            possible_queues_dict = {queue: schedules for queue, schedules in 
-                                    tmp_schedules_dict.items() if schedules}
-            if not possible_queues_dict:
-                break
-            ready_queues_dict = {queue: schedules for queue, schedules in 
-                                    possible_queues_dict.items() if 
-                                 schedules[0].start <= current_time}
-            if not ready_queues_dict:
-                current_time += 1
-                continue
-            best_queue = min(ready_queues_dict.keys(), 
-                             key=lambda queue: queue.priority)
-            best_schedule = ready_queues_dict[best_queue][0]
-            if cpu_schedules and cpu_schedules[-1].process_name == \
-                    best_schedule.process_name:
-                cpu_schedules[-1].duration += 1
-            else:
-                cpu_schedules.append(Schedule(
-                    process_name=best_schedule.process_name,
-                    start=current_time,
-                    duration=1,
-                    ))
-            best_schedule.duration -= 1
-            if best_schedule.duration == 0:
-                ready_queues_dict[best_queue].remove(best_schedule)
-            current_time += 1
+        cpu_processes = QueueScheduler.all_processes(queues)
+        queue_list = list(schedules_dict.keys())
+        with instrument_logic.phase('PriorityQueueScheduler.merge'):
+            cpu_schedules = collect_runs(PriorityQueueScheduler.runs(
+                queue_list, 
+                [iter(schedules_dict[queue]) for queue in queue_list]),
+                                         merge=True)
 
         return QueueScheduler.schedules_post(cpu_schedules=cpu_schedules, 
                                              cpu_processes=cpu_processes,
                                              queues=queues, 
                                              schedules_dict=schedules_dict)
 
+    @override
+    @staticmethod
+    def stream(queues : list[Queue], 
+               arrivals : Iterable[tuple[Queue, Process]]
+               ) -> Iterator[Schedule]:
+        schedules_dict = QueueScheduler.stream_pre(queues, arrivals)
+        queue_list = list(schedules_dict.keys())
+        return coalesce_runs(PriorityQueueScheduler.runs(
+            queue_list, [schedules_dict[queue] for queue in queue_list]),
+                             merge=True)
+
 QUEUE_SCHEDULERS_DICT = {
         'Time Slice': SliceQueueScheduler(), 
         'Priority': PriorityQueueScheduler()
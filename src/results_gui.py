@@ -3,14 +3,23 @@
 @author Karim M. Ali <https://github.com/kmuali>
 @date May 07, 2024
 """
-from copy import deepcopy
+import bisect
+import math
 import tkinter as tk
 import tkinter.ttk as ttk
 import tkinter.font as font
 import queue_logic as ql
 import process_logic as pl
 from main_gui import RED_BG_ARGS, GREEN_BG_ARGS, BLUE_BG_ARGS, PAD_ARGS, \
-        LABEL_PAD_ARGS, PROCESS_FG, PROCESS_BG_DICT, PROCESS_BG_BLANK
+        LABEL_PAD_ARGS, PROCESS_FG, process_color
+
+GANTT_BAR_HEIGHT = 24
+GANTT_HEIGHT = 44
+GANTT_LABEL_WIDTH = 32 # narrowest bar that shows its process name
+GANTT_TICK_SPACING = 80 # minimum pixels between time ticks
+GANTT_SCROLL_UNIT = 40 # pixels per scroll arrow click
+GANTT_ZOOM_STEP = 1.25
+GANTT_MAX_ZOOM = 64 # pixels per time unit
 
 class ResultsTopLevel(tk.Toplevel):
     def __init__(self, main_window, 
@@ -23,10 +32,30 @@ class ResultsTopLevel(tk.Toplevel):
         font.nametofont("TkDefaultFont").configure(size=10)
         font.nametofont("TkTextFont").configure(size=12)
 
-        total_time = max(map(lambda tl: tl.total_time, schedule_timelines))
+        total_time = max(map(lambda tl: tl.total_time, schedule_timelines),
+                         default=0)
+        self.view = GanttView(total_time)
+
+        # Zoom options
+        self.zoom_frame = tk.Frame(self)
+        self.zoom_frame.pack(side=tk.TOP, fill=tk.X)
+        tk.Label(self.zoom_frame, text='Zoom:').pack(side=tk.LEFT, 
+                                                     **LABEL_PAD_ARGS)
+        tk.Button(self.zoom_frame, text='In', **BLUE_BG_ARGS,
+                  command=lambda: self.view.zoom(GANTT_ZOOM_STEP ** 4)
+                  ).pack(side=tk.LEFT, **LABEL_PAD_ARGS)
+        tk.Button(self.zoom_frame, text='Out', **BLUE_BG_ARGS,
+                  command=lambda: self.view.zoom(GANTT_ZOOM_STEP ** -4)
+                  ).pack(side=tk.LEFT, **LABEL_PAD_ARGS)
+        tk.Button(self.zoom_frame, text='Fit', **GREEN_BG_ARGS,
+                  command=self.view.fit).pack(side=tk.LEFT, **LABEL_PAD_ARGS)
+
+        self.view.scrollbar = tk.Scrollbar(self, orient=tk.HORIZONTAL,
+                                           command=self.view.xview)
+        self.view.scrollbar.pack(side=tk.BOTTOM, fill=tk.X, **PAD_ARGS)
 
         self.schedule_timeline_frames = [
-                ScheduleTimelineFrame(self, schedule_timeline, total_time) for 
+                ScheduleTimelineFrame(self, schedule_timeline, self.view) for 
                 schedule_timeline in schedule_timelines
                 ]
         for schedule_timeline_frame in self.schedule_timeline_frames:
@@ -70,60 +99,221 @@ class HeaderFrame(tk.Frame):
                  ).pack(side=tk.LEFT, **PAD_ARGS)
 
 
-class ScheduleFrame(tk.Frame):
-    def __init__(self, container, schedule : ql.Schedule):
-        super().__init__(container)
+class GanttView:
+    """Visible time window shared by the Gantt charts of a results window.
 
-        self.name_entry = tk.Entry(self, width=3,
-                                   fg='#fff',
-                    readonlybackground=PROCESS_BG_DICT[schedule.process_name] \
-                            if schedule.process_name in PROCESS_BG_DICT else \
-                            PROCESS_BG_BLANK)
-        self.name_entry.insert(0, schedule.process_name)
-        self.name_entry.configure(state='readonly')
-        self.name_entry.pack(side=tk.TOP, fill=tk.X)
+    ``start`` is the time at the left edge and ``scale`` the time per
+    pixel; charts redraw themselves from it, and the horizontal scrollbar
+    drives it through ``xview``.
+    """
+    def __init__(self, total_time : int):
+        self.total_time = max(total_time, 1)
+        self.start = 0.0
+        self.scale = 0.0 # fitted to the width on the first draw
+        self.canvases : list[SchedulesCanvas] = []
+        self.scrollbar : tk.Scrollbar | None = None
+        self.draw_pending = False
 
-        tk.Label(self, text=str(schedule.start)).pack(side=tk.LEFT, fill=tk.X)
+    def width(self) -> int:
+        return max(max((canvas.winfo_width() for canvas in self.canvases),
+                       default=1), 1)
 
+    def clamp(self, width : int):
+        # No further out than the whole timeline, no further in than
+        # GANTT_MAX_ZOOM pixels per time unit
+        self.scale = min(self.scale or math.inf, self.total_time / width)
+        self.scale = max(self.scale, 1 / GANTT_MAX_ZOOM)
+        self.start = min(max(self.start, 0.0), 
+                         max(self.total_time - width * self.scale, 0.0))
 
-class SchedulesFrame(tk.Frame):
-    def __init__(self, container, schedules : list[pl.Schedule],
-                 total_time : int):
-        super().__init__(container)
+    def draw(self):
+        self.draw_pending = False
+        width = self.width()
+        self.clamp(width)
+        for canvas in self.canvases:
+            canvas.draw()
+        if self.scrollbar is not None:
+            self.scrollbar.set(self.start / self.total_time, 
+                               (self.start + width * self.scale) / 
+                               self.total_time)
+
+    def request_draw(self, widget : tk.Widget):
+        """Draw once the pending events are handled, however many times
+        this is called until then."""
+        if not self.draw_pending:
+            self.draw_pending = True
+            widget.after_idle(self.draw)
+
+    def xview(self, *args):
+        width = self.width()
+        if args[0] == 'moveto':
+            self.start = float(args[1]) * self.total_time
+        elif args[0] == 'scroll':
+            pixels = width if args[2] == 'pages' else GANTT_SCROLL_UNIT
+            self.start += int(args[1]) * pixels * self.scale
+        self.draw()
+
+    def pan(self, pixels : int):
+        self.start += pixels * self.scale
+        self.draw()
+
+    def zoom(self, factor : float, x : float | None = None):
+        """Zoom in by ``factor`` (out if below 1), keeping the time under
+        pixel ``x`` in place."""
+        width = self.width()
+        if x is None:
+            x = width / 2
+        if not self.scale:
+            self.clamp(width)
+        anchor = self.start + x * self.scale
+        self.scale /= factor
+        self.clamp(width)
+        self.start = anchor - x * self.scale
+        self.draw()
+
+    def fit(self):
+        self.start = 0.0
+        self.scale = 0.0
+        self.draw()
+
+
+class SchedulesCanvas(tk.Canvas):
+    """Gantt chart of one timeline that only draws what is in view.
+
+    Zoomed out, it draws the level of the timeline's SchedulePyramid with
+    buckets just under a pixel wide, each as a bar as high as its
+    dominant process occupies it. Zoomed in, it bisects to the first
+    visible segment and draws every pixel column at most once, widening
+    segments narrower than a pixel. Either way a redraw costs O(pixels).
+    """
+    def __init__(self, container, schedule_timeline : ql.ScheduleTimeline,
+                 view : GanttView):
+        super().__init__(container, height=GANTT_HEIGHT, bg='#fff',
+                         highlightthickness=0)
+        schedules = schedule_timeline.schedule_list
+        if not isinstance(schedules, pl.ScheduleList):
+            schedules = pl.ScheduleList(schedules)
+        self.schedule_timeline = schedule_timeline
+        self.schedules = schedules
+        self.view = view
+        self.drag_x = 0
+        view.canvases.append(self)
+
+        self.bind('<Configure>', lambda _: self.view.request_draw(self))
+        # Wheel zooms around the pointer, Shift + wheel and dragging scroll
+        self.bind('<MouseWheel>', lambda event: self.on_wheel(
+            event, 1 if event.delta > 0 else -1))
+        self.bind('<Button-4>', lambda event: self.on_wheel(event, 1))
+        self.bind('<Button-5>', lambda event: self.on_wheel(event, -1))
+        self.bind('<ButtonPress-1>', self.on_press)
+        self.bind('<B1-Motion>', self.on_drag)
+
+    def on_wheel(self, event, direction : int):
+        if event.state & 0x0001: # Shift
+            self.view.xview('scroll', -direction, 'units')
+        else:
+            self.view.zoom(GANTT_ZOOM_STEP ** direction, event.x)
+
+    def on_press(self, event):
+        self.drag_x = event.x
+
+    def on_drag(self, event):
+        self.view.pan(self.drag_x - event.x)
+        self.drag_x = event.x
+
+    def draw(self):
+        self.delete('all')
+        width = self.winfo_width()
+        pyramid = self.schedule_timeline.pyramid
+        level = pyramid.level(self.view.scale)
+        if level is None:
+            self.draw_segments(width)
+        else:
+            self.draw_buckets(width, pyramid, level)
+        self.draw_ticks(width)
 
-        # Creating temporary schedules and filling gaps
-        tmp_schedules = []
-        current_time = 0
-        for schedule in deepcopy(schedules):
-            if schedule.start > current_time:
-                tmp_schedules.append(pl.Schedule('', current_time, 
-                                                 schedule.start - current_time))
-            tmp_schedules.append(schedule)
-            current_time = schedule.start + schedule.duration
+    def draw_buckets(self, width : int, pyramid : ql.SchedulePyramid, 
+                     level : int):
+        view = self.view
+        dominants = pyramid.dominants[level]
+        occupancies = pyramid.occupancies[level]
+        bucket_width = pyramid.bucket_width(level)
+        first = max(math.floor(view.start / bucket_width), 0)
+        last = min(math.ceil((view.start + width * view.scale) / 
+                             bucket_width), len(dominants))
 
-        if not tmp_schedules:
-            tmp_schedules.append(pl.Schedule('', 0, total_time))
+        # Neighbouring buckets that look the same become one rectangle
+        run_start, run_look = first, None
+        for index in range(first, last + 1):
+            look = None
+            if index < last and dominants[index] >= 0:
+                look = (dominants[index], max(round(
+                    occupancies[index] * GANTT_BAR_HEIGHT), 1))
+            if index < last and look == run_look:
+                continue
+            if run_look is not None:
+                process_id, height = run_look
+                left = (run_start * bucket_width - view.start) / view.scale
+                right = (index * bucket_width - view.start) / view.scale
+                self.create_rectangle(
+                        left, GANTT_BAR_HEIGHT - height, max(right, left + 1),
+                        GANTT_BAR_HEIGHT, width=0, 
+                        fill=process_color(pyramid.names[process_id]))
+            run_start, run_look = index, look
 
-        end_time = tmp_schedules[-1].start + tmp_schedules[-1].duration
-        if end_time < total_time:
-            tmp_schedules.append(pl.Schedule('', end_time, 
-                                             total_time - end_time))
+    def draw_segments(self, width : int):
+        view = self.view
+        view_end = view.start + width * view.scale
+        starts = self.schedules.starts
+        durations = self.schedules.durations
+        process_ids = self.schedules.process_ids
+        names = self.schedules.names
 
-        # Creating frames
-        for index, schedule in enumerate(tmp_schedules):
-            frame = ScheduleFrame(self, schedule)
-            weight = schedule.duration * 1_000_000 // total_time
-            self.columnconfigure(index=index, weight=weight)
-            frame.grid(row=0, column=index, sticky=tk.EW)
+        # First pixel column not drawn yet
+        taken = 0
+        index = max(bisect.bisect_right(starts, view.start) - 1, 0)
+        while index < len(starts) and starts[index] < view_end:
+            start = starts[index]
+            end = start + durations[index]
+            left = max(math.floor((start - view.start) / view.scale), taken)
+            right = max(math.ceil((end - view.start) / view.scale), 
+                        math.floor((start - view.start) / view.scale) + 1)
+            if right > left:
+                name = names[process_ids[index]]
+                self.create_rectangle(left, 0, right, GANTT_BAR_HEIGHT,
+                                      width=0, fill=process_color(name))
+                if right - left >= GANTT_LABEL_WIDTH:
+                    self.create_text((left + right) / 2, GANTT_BAR_HEIGHT / 2,
+                                     text=name, fill=PROCESS_FG)
+                taken = right
+            # Skip to the segment under the first free pixel column
+            index = max(index + 1, bisect.bisect_right(
+                starts, view.start + taken * view.scale) - 1)
 
-        tk.Label(self, text=str(total_time)).grid(row=0, 
-                                                  column=len(tmp_schedules), 
-                                                  sticky=tk.S)
+    def draw_ticks(self, width : int):
+        view = self.view
+        # A round step of 1, 2 or 5 times a power of ten, at least
+        # GANTT_TICK_SPACING pixels apart
+        minimum = GANTT_TICK_SPACING * view.scale
+        step = 10 ** math.floor(math.log10(minimum))
+        for multiple in (1, 2, 5, 10):
+            if step * multiple >= minimum:
+                step *= multiple
+                break
+        step = max(round(step), 1)
+        tick = math.ceil(view.start / step) * step
+        while tick <= min(view.start + width * view.scale, 
+                          view.total_time):
+            x = (tick - view.start) / view.scale
+            self.create_line(x, GANTT_BAR_HEIGHT, x, GANTT_BAR_HEIGHT + 4)
+            self.create_text(x, GANTT_BAR_HEIGHT + 5, text=str(tick),
+                             anchor=tk.N)
+            tick += step
 
 
 class ScheduleTimelineFrame(tk.LabelFrame):
     def __init__(self, container, schedule_timeline : ql.ScheduleTimeline,
-                 total_time : int):
+                 view : GanttView):
         super().__init__(container)
 
         self.header_frame = HeaderFrame(self, schedule_timeline)
@@ -131,7 +321,5 @@ class ScheduleTimelineFrame(tk.LabelFrame):
 
         ttk.Separator(self, orient='horizontal').pack(side=tk.TOP, fill=tk.X)
 
-        self.schedules_frame = SchedulesFrame(self, 
-                                              schedule_timeline.schedule_list,
-                                              total_time)
-        self.schedules_frame.pack(side=tk.TOP, fill=tk.X, **PAD_ARGS)
+        self.schedules_canvas = SchedulesCanvas(self, schedule_timeline, view)
+        self.schedules_canvas.pack(side=tk.TOP, fill=tk.X, **PAD_ARGS)
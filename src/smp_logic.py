@@ -0,0 +1,316 @@
+"""
+@file smp_logic.py
+@date Oct 18, 2026
+
+Multi-core simulation: the processes of a multilevel queue share N CPUs.
+
+Ready processes are ranked by (queue priority, queue order) and, within a
+queue, the way its process scheduler would rank them: FCFS, LPF and SRTF
+by their ``key``, round robin in FIFO order with the queue quantum. Free
+cores take the best ready process; a newly ready process preempts the
+worst running one if it belongs to a better queue, or to the same queue
+and that queue's scheduler is preemptive. Queue slice times do not apply;
+between queues the CPUs always go by priority.
+
+Run queues are either global, shared by every core, or per core, with
+processes placed round robin in arrival order. With work stealing a core
+that runs out of work takes the best process of the longest other run
+queue.
+
+The engine jumps from event to event (arrivals, completions, quantum
+expiries and preemptions), so its cost follows the number of events and
+not cores x ticks.
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor
+from typing_extensions import override
+import heapq
+import instrument_logic
+import itertools
+import process_logic as pl
+import queue_logic as ql
+
+
+def _policy(process_scheduler : pl.ProcessScheduler
+            ) -> tuple[Callable[[pl.Process, int], int] | None, bool]:
+    """(key(process, remaining), preemptive) of a process scheduler; the
+    key is None for round robin, which keeps FIFO order."""
+    if isinstance(process_scheduler, pl.RRScheduler):
+        return None, False
+    key = type(process_scheduler).key
+    if process_scheduler.preemptive:
+        return key, True
+    return lambda process, remaining: key(process), False
+
+
+class _Engine:
+    """State of one SMP run. Ready entries are (queue priority, queue
+    index, key, order, state) with state = [process, remaining, index in
+    its queue, queue index]."""
+    def __init__(self, queue_list : list[ql.Queue], cores : int,
+                 per_core : bool, work_stealing : bool):
+        self.queue_list = queue_list
+        self.policies = [_policy(queue.process_scheduler)
+                         for queue in queue_list]
+        self.cores = cores
+        self.per_core = per_core
+        self.work_stealing = work_stealing and per_core
+
+        self.run_queues : list[list[tuple]] = [
+                [] for _ in range(cores if per_core else 1)]
+        self.ready_count = 0
+        self.fifo_order = 0
+        self.decisions = 0
+        # Per core: running state, its ready entry, start of the run and
+        # a token that invalidates stop events and running heap entries
+        self.running : list[list | None] = [None] * cores
+        self.entries : list[tuple | None] = [None] * cores
+        self.starts = [0] * cores
+        self.tokens = [0] * cores
+        self.idle = list(range(cores))
+        self.is_idle = [True] * cores
+        # (stop time, core, token)
+        self.stops : list[tuple[int, int, int]] = []
+        # Worst running process first, only for global run queues
+        self.running_heap : list[tuple] = []
+
+        self.schedule_lists = [pl.ScheduleList() for _ in range(cores)]
+        self.finished : list[list[pl.Process]] = [[] for _ in range(cores)]
+
+    def push(self, run_queue : int, state : list):
+        process, remaining, index, queue_index = state
+        key, _ = self.policies[queue_index]
+        if key is None:
+            entry = (self.queue_list[queue_index].priority, queue_index, 0,
+                     self.fifo_order, state)
+            self.fifo_order += 1
+        else:
+            entry = (self.queue_list[queue_index].priority, queue_index,
+                     key(process, remaining), index, state)
+        heapq.heappush(self.run_queues[run_queue], entry)
+        self.ready_count += 1
+
+    def pop(self, run_queue : int) -> tuple:
+        self.ready_count -= 1
+        return heapq.heappop(self.run_queues[run_queue])
+
+    def idle_core(self) -> int | None:
+        while self.idle:
+            core = heapq.heappop(self.idle)
+            if self.is_idle[core]:
+                return core
+        return None
+
+    def start(self, core : int, entry : tuple, time : int):
+        state = entry[4]
+        process, remaining, index, queue_index = state
+        key, preemptive = self.policies[queue_index]
+        duration = remaining if key is not None else \
+                min(remaining, self.queue_list[queue_index].quantum)
+        self.decisions += 1
+        self.running[core] = state
+        self.entries[core] = entry
+        self.starts[core] = time
+        self.tokens[core] += 1
+        self.is_idle[core] = False
+        heapq.heappush(self.stops, (time + duration, core, self.tokens[core]))
+        if not self.per_core:
+            # Ranking by key(process, remaining + start) orders running
+            # SRTF processes by their current remaining time too
+            running_key = key(process, remaining + time) if preemptive else 0
+            heapq.heappush(self.running_heap, (
+                -entry[0], -queue_index, -running_key, -entry[3],
+                core, self.tokens[core]))
+
+    def stop(self, core : int, time : int) -> list:
+        """Take the running process off the core, recording its run."""
+        state = self.running[core]
+        duration = time - self.starts[core]
+        if duration > 0:
+            schedules = self.schedule_lists[core]
+            if schedules.process_ids and \
+                    schedules.names[schedules.process_ids[-1]] == \
+                    state[0].name and \
+                    schedules.starts[-1] + schedules.durations[-1] == \
+                    self.starts[core]:
+                schedules.durations[-1] += duration
+            else:
+                schedules.add(state[0].name, self.starts[core], duration)
+        state[1] -= duration
+        self.running[core] = self.entries[core] = None
+        self.tokens[core] += 1
+        self.is_idle[core] = True
+        if not self.per_core or self.work_stealing:
+            heapq.heappush(self.idle, core)
+        return state
+
+    def worst_running(self, run_queue : int) -> int | None:
+        if self.per_core:
+            return run_queue if self.running[run_queue] is not None else None
+        while self.running_heap:
+            *_, core, token = self.running_heap[0]
+            if token == self.tokens[core]:
+                return core
+            heapq.heappop(self.running_heap)
+        return None
+
+    def beats(self, entry : tuple, core : int, time : int) -> bool:
+        """Whether a ready entry should preempt the process on core."""
+        running = self.entries[core]
+        if entry[:2] != running[:2]:
+            return entry[:2] < running[:2]
+        key, preemptive = self.policies[entry[1]]
+        if not preemptive:
+            return False
+        state = self.running[core]
+        current_key = key(state[0], state[1] - (time - self.starts[core]))
+        return (entry[2], entry[3]) < (current_key, running[3])
+
+    def dispatch(self, touched : set[int], time : int):
+        if not self.per_core:
+            while self.run_queues[0]:
+                core = self.idle_core()
+                if core is None:
+                    break
+                self.start(core, self.pop(0), time)
+        else:
+            for core in sorted(touched):
+                if self.is_idle[core] and self.run_queues[core]:
+                    self.start(core, self.pop(core), time)
+            while self.work_stealing and self.ready_count:
+                core = self.idle_core()
+                if core is None:
+                    break
+                victim = max(range(self.cores),
+                             key=lambda run_queue:
+                             len(self.run_queues[run_queue]))
+                self.start(core, self.pop(victim), time)
+
+    def preempt(self, touched : set[int], time : int):
+        for run_queue in sorted(touched):
+            heap = self.run_queues[run_queue]
+            while heap:
+                core = self.worst_running(run_queue)
+                if core is None or not self.beats(heap[0], core, time):
+                    break
+                entry = self.pop(run_queue)
+                self.push(run_queue, self.stop(core, time))
+                self.start(core, entry, time)
+
+    def run(self, arrivals : list[tuple[int, int, int, pl.Process]]):
+        position = 0
+        while position < len(arrivals) or self.stops:
+            while self.stops and \
+                    self.stops[0][2] != self.tokens[self.stops[0][1]]:
+                heapq.heappop(self.stops)
+            if position < len(arrivals) and (
+                    not self.stops or arrivals[position][0] <=
+                    self.stops[0][0]):
+                time = arrivals[position][0]
+            elif self.stops:
+                time = self.stops[0][0]
+            else:
+                break
+
+            touched : set[int] = set()
+            # Arrivals go first, so a process whose quantum expires at the
+            # same time queues up behind them, as in RRScheduler
+            while position < len(arrivals) and \
+                    arrivals[position][0] == time:
+                _, queue_index, index, process = arrivals[position]
+                run_queue = position % self.cores if self.per_core else 0
+                self.push(run_queue, [process, process.burst, index,
+                                      queue_index])
+                touched.add(run_queue)
+                position += 1
+            while self.stops and self.stops[0][0] == time:
+                _, core, token = heapq.heappop(self.stops)
+                if token != self.tokens[core]:
+                    continue
+                state = self.stop(core, time)
+                run_queue = core if self.per_core else 0
+                touched.add(run_queue)
+                if state[1] > 0:
+                    self.push(run_queue, state)
+                else:
+                    self.finished[core].append(state[0])
+
+            self.dispatch(touched, time)
+            self.preempt(touched, time)
+
+
+class SMPScheduler(ql.QueueScheduler):
+    """Multilevel queue scheduler for ``cores`` CPUs.
+
+    ``schedule`` returns the aggregate timeline of all cores first and
+    then one timeline per core, which only counts the processes that
+    finished on that core. There are no isolated queue schedules to
+    compute, so ``executor`` is not used. Cores do not merge isolated
+    queue schedules, so there is no ``stream`` or ``runs``.
+    """
+    def __init__(self, cores : int, per_core : bool = False,
+                 work_stealing : bool = False):
+        if cores < 1:
+            raise ValueError(f'Need at least one core, got {cores}')
+        self.cores = cores
+        self.per_core = per_core
+        self.work_stealing = work_stealing
+
+    @override
+    def schedule(self, queues : list[ql.Queue],
+                 executor : Executor | None = None
+                 ) -> list[ql.ScheduleTimeline]:
+        arrivals = [(process.arrival, queue_index, index, process)
+                    for queue_index, queue in enumerate(queues)
+                    for index, process in enumerate(queue.processes)
+                    if process.burst > 0]
+        arrivals.sort(key=lambda arrival: arrival[:3])
+        engine = _Engine(queues, self.cores, self.per_core,
+                         self.work_stealing)
+        with instrument_logic.phase('SMPScheduler.run'):
+            engine.run(arrivals)
+            if instrument_logic.active() is not None:
+                end = max((schedules.starts[-1] + schedules.durations[-1]
+                           for schedules in engine.schedule_lists
+                           if schedules), default=0)
+                ticks = sum(sum(schedules.durations)
+                            for schedules in engine.schedule_lists)
+                instrument_logic.count('decisions', engine.decisions)
+                instrument_logic.count('ticks', ticks)
+                instrument_logic.count('idle_ticks', end * self.cores - ticks)
+                instrument_logic.count('segments', sum(
+                    len(schedules) for schedules in engine.schedule_lists))
+
+        with instrument_logic.phase('SMPScheduler.schedules_post'):
+            # Every core's list is in start order already
+            aggregate = pl.ScheduleList()
+            for start, core, index in heapq.merge(*(
+                    zip(schedules.starts, itertools.repeat(core),
+                        range(len(schedules)))
+                    for core, schedules in enumerate(engine.schedule_lists))):
+                schedules = engine.schedule_lists[core]
+                aggregate.add(schedules.names[schedules.process_ids[index]],
+                              start, schedules.durations[index])
+            timelines = [ql.ScheduleTimeline(
+                name='CPU', schedule_list=aggregate,
+                processes=ql.QueueScheduler.all_processes(queues))]
+            timelines.extend(
+                    ql.ScheduleTimeline(name=f'CPU {core}',
+                                        schedule_list=schedules,
+                                        processes=engine.finished[core])
+                    for core, schedules in enumerate(engine.schedule_lists))
+        return timelines
+
+    @override
+    def stream(self, queues : list[ql.Queue],
+               arrivals : Iterable[tuple[ql.Queue, pl.Process]]
+               ) -> Iterator[pl.Schedule]:
+        raise TypeError('stream is not supported in SMP mode')
+
+    @override
+    def runs(self, queue_list : list[ql.Queue],
+             schedule_iterators : list[Iterator[pl.Schedule]],
+             checkpoint : pl.Checkpoint | None = None,
+             state : tuple | None = None) -> Iterator[pl.Run]:
+        raise TypeError('runs is not supported in SMP mode')
@@ -0,0 +1,140 @@
+"""
+@file sweep_logic.py
+@date Oct 18, 2026
+
+Parameter sweeps: run one workload under every combination of a grid of
+settings on all cores and collect the ScheduleTimeline metrics as rows.
+
+A grid maps axis names to lists of values::
+
+    {"queue_scheduler": ["Time Slice", "Priority"],
+     "Q1.quantum": [2, 4, 8],
+     "Q1.process_scheduler": ["RR", "SRTF-P"],
+     "Q2.slice_time": [5, 10],
+     "Q2.priority": [0, 1]}
+
+``queue_scheduler`` picks an entry of QUEUE_SCHEDULERS_DICT and
+``<queue>.<option>`` sets ``quantum``, ``slice_time``, ``priority`` or
+``process_scheduler`` (a PROCESS_SCHEDULERS_DICT key) of that queue. Axes
+that are left out keep the workload's own settings.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Any, Iterator
+import itertools
+import metrics_logic as ml
+import process_logic as pl
+import queue_logic as ql
+
+
+QUEUE_OPTIONS = ('quantum', 'slice_time', 'priority', 'process_scheduler')
+TIMELINE_METRICS = ('context_switches', 'avg_wait', 'max_wait', 'min_wait',
+                    'total_time')
+METRICS = TIMELINE_METRICS + ml.METRICS
+
+# Workload of the current worker process, see _init_worker
+_worker_queues : list[ql.Queue] = []
+
+
+def validate_grid(queues : list[ql.Queue], grid : dict[str, list]):
+    queue_names = {queue.name for queue in queues}
+    for axis, values in grid.items():
+        if not isinstance(values, list) or not values:
+            raise ValueError(f'Axis {axis!r} needs a non-empty list of values')
+        if axis == 'queue_scheduler':
+            keys = ql.QUEUE_SCHEDULERS_DICT
+        else:
+            queue_name, _, option = axis.rpartition('.')
+            if queue_name not in queue_names:
+                raise ValueError(f'Axis {axis!r} names an unknown queue')
+            if option not in QUEUE_OPTIONS:
+                raise ValueError(f'Axis {axis!r} sets an unknown option, '
+                                 f'expected one of {QUEUE_OPTIONS}')
+            if option != 'process_scheduler':
+                continue
+            keys = pl.PROCESS_SCHEDULERS_DICT
+        for value in values:
+            if value not in keys:
+                raise ValueError(f'Axis {axis!r} has unknown scheduler '
+                                 f'{value!r}')
+
+
+def expand_grid(grid : dict[str, list]) -> Iterator[dict[str, Any]]:
+    """Yield every configuration of the grid, in a deterministic order."""
+    axes = list(grid.keys())
+    for values in itertools.product(*(grid[axis] for axis in axes)):
+        yield dict(zip(axes, values))
+
+
+def configure(queues : list[ql.Queue], config : dict[str, Any]
+              ) -> tuple[ql.QueueScheduler, list[ql.Queue]]:
+    """Apply a configuration to copies of the queues.
+
+    The copies share the process lists of the originals.
+    """
+    queue_scheduler = list(ql.QUEUE_SCHEDULERS_DICT.values())[0]
+    changes : dict[str, dict[str, Any]] = {}
+    for axis, value in config.items():
+        if axis == 'queue_scheduler':
+            queue_scheduler = ql.QUEUE_SCHEDULERS_DICT[value]
+            continue
+        queue_name, _, option = axis.rpartition('.')
+        if option == 'process_scheduler':
+            value = pl.PROCESS_SCHEDULERS_DICT[value]
+        changes.setdefault(queue_name, {})[option] = value
+    configured = [replace(queue, **changes.get(queue.name, {}))
+                  for queue in queues]
+    return queue_scheduler, configured
+
+
+def run_config(queues : list[ql.Queue], config : dict[str, Any]
+               ) -> list[dict[str, Any]]:
+    """Simulate one configuration; one row per resulting timeline."""
+    queue_scheduler, configured = configure(queues, config)
+    # The CPU timeline comes first, then one per queue
+    processes_lists = [ql.QueueScheduler.all_processes(configured)]
+    processes_lists.extend(queue.processes for queue in configured)
+    rows = []
+    for schedule_timeline, processes in zip(
+            queue_scheduler.schedule(configured), processes_lists):
+        row = dict(config)
+        row['timeline'] = schedule_timeline.name
+        for metric in TIMELINE_METRICS:
+            row[metric] = getattr(schedule_timeline, metric)
+        row.update(ml.MetricsAccumulator.of(schedule_timeline.schedule_list,
+                                            processes).summary())
+        rows.append(row)
+    return rows
+
+
+def _init_worker(queues : list[ql.Queue]):
+    global _worker_queues
+    _worker_queues = queues
+
+
+def _run_worker_config(config : dict[str, Any]) -> list[dict[str, Any]]:
+    return run_config(_worker_queues, config)
+
+
+def sweep(queues : list[ql.Queue], grid : dict[str, list],
+          max_workers : int | None = None, chunksize : int = 16
+          ) -> Iterator[dict[str, Any]]:
+    """Run every configuration of the grid and yield the metric rows.
+
+    The workload is sent to each worker once; configurations are then
+    handed out in chunks of ``chunksize``. Rows come back in grid order.
+    With ``max_workers=1`` everything runs in this process.
+    """
+    validate_grid(queues, grid)
+    configs = expand_grid(grid)
+    if max_workers == 1:
+        for config in configs:
+            yield from run_config(queues, config)
+        return
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             initializer=_init_worker,
+                             initargs=(queues,)) as executor:
+        for rows in executor.map(_run_worker_config, configs,
+                                 chunksize=chunksize):
+            yield from rows
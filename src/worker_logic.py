@@ -0,0 +1,112 @@
+"""
+@file worker_logic.py
+@date Oct 18, 2026
+
+Runs simulations off the Tk main loop. A SimulationWorker schedules on a
+background thread and reports through a thread-safe queue, which the GUI
+drains from an ``after()`` callback::
+
+    worker = SimulationWorker(simulator)
+    worker.start(queue_scheduler, queues)
+    ...
+    for message in worker.messages():
+        ...
+"""
+
+from dataclasses import dataclass, replace
+from typing import Iterator
+import queue
+import threading
+import incremental_logic as il
+import queue_logic as ql
+
+
+@dataclass(slots=True)
+class Progress:
+    stage : str
+    time : int
+    segments : int
+
+
+@dataclass(slots=True)
+class Finished:
+    schedule_timelines : list[ql.ScheduleTimeline]
+
+
+@dataclass(slots=True)
+class Cancelled:
+    pass
+
+
+@dataclass(slots=True)
+class Failed:
+    error : Exception
+
+
+class SimulationCancelled(Exception):
+    pass
+
+
+class SimulationWorker:
+    """Runs one simulation at a time on a daemon thread.
+
+    The thread only touches copies of the queues and processes, so the
+    GUI can keep editing its own while it runs. Cancelling takes effect
+    at the next engine checkpoint.
+    """
+    def __init__(self, simulator : il.IncrementalSimulator):
+        self.simulator = simulator
+        self.results : queue.Queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.thread : threading.Thread | None = None
+
+    def is_running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, queue_scheduler : ql.QueueScheduler,
+              queues : list[ql.Queue]):
+        if self.is_running():
+            raise RuntimeError('A simulation is already running')
+        queues = [replace(queue_object, processes=[
+            replace(process) for process in queue_object.processes])
+                  for queue_object in queues]
+        self.cancel_event = threading.Event()
+        self.thread = threading.Thread(
+                target=self.run, daemon=True,
+                args=(queue_scheduler, queues, self.cancel_event))
+        self.thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self, queue_scheduler : ql.QueueScheduler,
+            queues : list[ql.Queue], cancel_event : threading.Event):
+        def progress(stage : str, time : int, segments : int):
+            if cancel_event.is_set():
+                raise SimulationCancelled()
+            self.results.put(Progress(stage, time, segments))
+
+        try:
+            schedule_timelines = self.simulator.schedule(queue_scheduler,
+                                                         queues, progress)
+            # Build the zoomed-out summaries here rather than when the
+            # results window first draws
+            for schedule_timeline in schedule_timelines:
+                progress(f'Summarizing {schedule_timeline.name}',
+                         schedule_timeline.total_time,
+                         len(schedule_timeline.schedule_list))
+                schedule_timeline.pyramid
+        except SimulationCancelled:
+            self.results.put(Cancelled())
+        except Exception as error:
+            self.results.put(Failed(error))
+        else:
+            self.results.put(Finished(schedule_timelines))
+
+    def messages(self) -> Iterator[Progress | Finished | Cancelled | Failed]:
+        """Messages posted since the last call, without blocking."""
+        while True:
+            try:
+                yield self.results.get_nowait()
+            except queue.Empty:
+                return
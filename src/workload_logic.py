@@ -0,0 +1,176 @@
+"""
+@file workload_logic.py
+@date Oct 18, 2026
+
+Reading and writing workloads as JSON/CSV files and turning timelines into
+plain dicts. Nothing in here touches tkinter, so it is safe to use
+headless.
+
+JSON workloads look like::
+
+    {"queues": [{"name": "Q1", "process_scheduler": "RR", "quantum": 8,
+                 "priority": 0, "slice_time": 10,
+                 "processes": [{"name": "P1", "arrival": 0, "burst": 5,
+                                "priority": 0}]}]}
+
+CSV workloads have one row per process with the columns ``queue, name,
+arrival, burst, priority`` and optionally ``process_scheduler, quantum,
+queue_priority, slice_time``; the first row of a queue sets its options.
+Missing queue options get the same defaults as a new queue in the GUI.
+Queues without processes cannot be written to CSV.
+"""
+
+import csv
+import json
+import os
+import process_logic as pl
+import queue_logic as ql
+
+
+CSV_FIELDS = ('queue', 'name', 'arrival', 'burst', 'priority',
+              'process_scheduler', 'quantum', 'queue_priority', 'slice_time')
+
+QUEUE_DEFAULTS = dict(
+        process_scheduler=list(pl.PROCESS_SCHEDULERS_DICT.keys())[0],
+        quantum=8,
+        priority=0,
+        slice_time=10,
+        )
+
+
+def make_queue(name : str, process_scheduler : str | None = None,
+               quantum : int | None = None, priority : int | None = None,
+               slice_time : int | None = None) -> ql.Queue:
+    if process_scheduler is None:
+        process_scheduler = QUEUE_DEFAULTS['process_scheduler']
+    if process_scheduler not in pl.PROCESS_SCHEDULERS_DICT:
+        raise ValueError(f'Unknown process scheduler {process_scheduler!r} '
+                         f'for queue {name!r}')
+    return ql.Queue(
+            name=name,
+            quantum=QUEUE_DEFAULTS['quantum'] if quantum is None else quantum,
+            priority=QUEUE_DEFAULTS['priority'] if priority is None else
+                    priority,
+            slice_time=QUEUE_DEFAULTS['slice_time'] if slice_time is None
+                    else slice_time,
+            processes=[],
+            process_scheduler=pl.PROCESS_SCHEDULERS_DICT[process_scheduler],
+            )
+
+
+def queues_from_json(data : dict) -> list[ql.Queue]:
+    queues = []
+    for queue_data in data['queues']:
+        queue = make_queue(
+                name=str(queue_data['name']),
+                process_scheduler=queue_data.get('process_scheduler'),
+                quantum=queue_data.get('quantum'),
+                priority=queue_data.get('priority'),
+                slice_time=queue_data.get('slice_time'),
+                )
+        for process_data in queue_data.get('processes', []):
+            queue.processes.append(pl.Process(
+                name=str(process_data['name']),
+                arrival=int(process_data['arrival']),
+                burst=int(process_data['burst']),
+                priority=int(process_data.get('priority', 0)),
+                ))
+        queues.append(queue)
+    return queues
+
+
+def queues_from_csv(rows : list[dict[str, str]]) -> list[ql.Queue]:
+    def optional_int(row : dict[str, str], key : str) -> int | None:
+        return int(row[key]) if row.get(key) else None
+
+    queues_dict : dict[str, ql.Queue] = {}
+    for row in rows:
+        queue_name = row['queue']
+        if queue_name not in queues_dict:
+            queues_dict[queue_name] = make_queue(
+                    name=queue_name,
+                    process_scheduler=row.get('process_scheduler') or None,
+                    quantum=optional_int(row, 'quantum'),
+                    priority=optional_int(row, 'queue_priority'),
+                    slice_time=optional_int(row, 'slice_time'),
+                    )
+        queues_dict[queue_name].processes.append(pl.Process(
+            name=row['name'],
+            arrival=int(row['arrival']),
+            burst=int(row['burst']),
+            priority=optional_int(row, 'priority') or 0,
+            ))
+    return list(queues_dict.values())
+
+
+def load_workload(path : str) -> list[ql.Queue]:
+    """Load the queues of a ``.json`` or ``.csv`` workload file."""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, newline='') as file:
+        if extension == '.json':
+            return queues_from_json(json.load(file))
+        if extension == '.csv':
+            return queues_from_csv(list(csv.DictReader(file)))
+    raise ValueError(f'Unsupported workload format {extension!r}, '
+                     'expected .json or .csv')
+
+
+def queues_to_json(queues : list[ql.Queue]) -> dict:
+    return {'queues': [
+        dict(name=queue.name,
+             process_scheduler=pl.get_process_scheduler_key(
+                 queue.process_scheduler),
+             quantum=queue.quantum,
+             priority=queue.priority,
+             slice_time=queue.slice_time,
+             processes=[dict(name=process.name, arrival=process.arrival,
+                             burst=process.burst, priority=process.priority)
+                        for process in queue.processes])
+        for queue in queues]}
+
+
+def queues_to_csv(queues : list[ql.Queue]) -> list[dict[str, str | int]]:
+    """One row per process, every row repeating the options of its
+    queue."""
+    return [
+            dict(queue=queue.name, name=process.name, arrival=process.arrival,
+                 burst=process.burst, priority=process.priority,
+                 process_scheduler=pl.get_process_scheduler_key(
+                     queue.process_scheduler),
+                 quantum=queue.quantum, queue_priority=queue.priority,
+                 slice_time=queue.slice_time)
+            for queue in queues for process in queue.processes
+            ]
+
+
+def dump_workload(queues : list[ql.Queue], path : str):
+    """Write the queues to a ``.json`` or ``.csv`` workload file that
+    load_workload reads back."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in ('.json', '.csv'):
+        raise ValueError(f'Unsupported workload format {extension!r}, '
+                         'expected .json or .csv')
+    with open(path, 'w', newline='') as file:
+        if extension == '.json':
+            json.dump(queues_to_json(queues), file, indent=1)
+        else:
+            writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(queues_to_csv(queues))
+
+
+def timeline_to_dict(schedule_timeline : ql.ScheduleTimeline) -> dict:
+    return dict(
+            name=schedule_timeline.name,
+            context_switches=schedule_timeline.context_switches,
+            avg_wait=schedule_timeline.avg_wait,
+            max_wait=schedule_timeline.max_wait,
+            min_wait=schedule_timeline.min_wait,
+            total_time=schedule_timeline.total_time,
+            schedule_list=[
+                dict(process_name=schedule.process_name,
+                     start=schedule.start,
+                     duration=schedule.duration)
+                for schedule in schedule_timeline.schedule_list
+                ],
+            )